@@ -0,0 +1,188 @@
+import os
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import Profile, Project, Skill, proficiency_score
+from schemas import BatchItemResult, BatchResponse
+from tags import resolve_skill_ids, set_project_skills, unknown_skills, untag
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+# Batch writes validate every item on its own, write all valid items in one
+# transaction with a single executemany, and report one result per item.
+
+
+def _check_size(n: int) -> None:
+    if n == 0:
+        raise HTTPException(400, "Empty batch")
+    if n > BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"Batch too large (max {BATCH_MAX_ITEMS} items)")
+
+
+def _error_text(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc']) or 'item'}: {e['msg']}" for e in err.errors()
+    )
+
+
+def _response(results: list[BatchItemResult]) -> BatchResponse:
+    ok = sum(1 for r in results if r.ok)
+    return BatchResponse(succeeded=ok, failed=len(results) - ok, results=results)
+
+
+def _resolve_tags(db: Session, profile_id: int, rows, positions, results, tag_names) -> tuple[list, list, dict]:
+    """Resolve each row's skill names; rows naming unknown skills are reported and dropped."""
+    found = resolve_skill_ids(db, profile_id, [n for names in tag_names if names for n in names])
+    kept_rows, kept_positions, tags = [], [], {}
+    for i, row, names in zip(positions, rows, tag_names):
+        missing = unknown_skills(names or [], found)
+        if missing:
+            results[i] = BatchItemResult(
+                index=i, ok=False, id=row.get("id"), error=f"skills: unknown {', '.join(missing)}"
+            )
+            continue
+        if names is not None:
+            tags[i] = {found[n.strip().lower()] for n in names if n.strip()}
+        kept_rows.append(row)
+        kept_positions.append(i)
+    return kept_rows, kept_positions, tags
+
+
+def batch_create(
+    db: Session,
+    model,
+    schema: type[BaseModel],
+    items: list[Any],
+    unique_field: str | None = None,
+) -> BatchResponse:
+    _check_size(len(items))
+    profile_id = db.execute(select(Profile.id).order_by(Profile.id).limit(1)).scalar()
+    if profile_id is None:
+        raise HTTPException(400, "Create profile first")
+
+    results: list[BatchItemResult | None] = [None] * len(items)
+    rows, positions, tag_names = [], [], []
+    for i, item in enumerate(items):
+        try:
+            data = schema.model_validate(item).model_dump()
+        except ValidationError as e:
+            results[i] = BatchItemResult(index=i, ok=False, error=_error_text(e))
+            continue
+        tag_names.append(data.pop("skills", None) if model is Project else None)
+        if model is Skill:
+            # Core inserts bypass the ORM validator that keeps score in sync
+            data["score"] = proficiency_score(data["proficiency"])
+        rows.append({**data, "profile_id": profile_id})
+        positions.append(i)
+
+    tags = {}
+    if model is Project and rows:
+        rows, positions, tags = _resolve_tags(db, profile_id, rows, positions, results, tag_names)
+
+    if unique_field and rows:
+        # report duplicates per item instead of failing the whole insert
+        column = getattr(model, unique_field)
+        taken = set(db.execute(
+            select(column).where(model.profile_id == profile_id, column.in_([r[unique_field] for r in rows]))
+        ).scalars())
+        kept_rows, kept_positions = [], []
+        for i, row in zip(positions, rows):
+            if row[unique_field] in taken:
+                results[i] = BatchItemResult(index=i, ok=False, error=f"{unique_field}: already exists")
+                continue
+            taken.add(row[unique_field])
+            kept_rows.append(row)
+            kept_positions.append(i)
+        rows, positions = kept_rows, kept_positions
+
+    if rows:
+        ids = db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        for i, new_id in zip(positions, ids):
+            results[i] = BatchItemResult(index=i, ok=True, id=new_id)
+        set_project_skills(db, {new_id: tags[i] for i, new_id in zip(positions, ids) if i in tags})
+    return _response(results)
+
+
+def batch_update(db: Session, model, schema: type[BaseModel], items: list[Any]) -> BatchResponse:
+    _check_size(len(items))
+    results: list[BatchItemResult | None] = [None] * len(items)
+    rows, positions = [], []
+    for i, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if isinstance(item_id, bool) or not isinstance(item_id, int):  # bool is an int subclass
+            results[i] = BatchItemResult(index=i, ok=False, error="id: required integer")
+            continue
+        try:
+            data = schema.model_validate({k: v for k, v in item.items() if k != "id"})
+        except ValidationError as e:
+            results[i] = BatchItemResult(index=i, ok=False, id=item_id, error=_error_text(e))
+            continue
+        row = {**data.model_dump(exclude_unset=True), "id": item_id}
+        if model is Skill and "proficiency" in row:
+            row["score"] = proficiency_score(row["proficiency"])
+        rows.append(row)
+        positions.append(i)
+
+    owners = {}
+    if rows:
+        owners = dict(db.execute(
+            select(model.id, model.profile_id).where(model.id.in_([r["id"] for r in rows]))
+        ).all())
+    kept_rows, kept_positions = [], []
+    for i, row in zip(positions, rows):
+        if row["id"] not in owners:
+            results[i] = BatchItemResult(index=i, ok=False, id=row["id"], error="Not found")
+            continue
+        kept_rows.append(row)
+        kept_positions.append(i)
+    rows, positions = kept_rows, kept_positions
+
+    tags = {}
+    if model is Project and rows:
+        tag_names = [row.pop("skills", None) for row in rows]
+        kept_rows, kept_positions = [], []
+        for profile_id in {owners[r["id"]] for r in rows}:
+            mine = [k for k, r in enumerate(rows) if owners[r["id"]] == profile_id]
+            p_rows, p_positions, p_tags = _resolve_tags(
+                db, profile_id, [rows[k] for k in mine], [positions[k] for k in mine], results,
+                [tag_names[k] for k in mine],
+            )
+            kept_rows += p_rows
+            kept_positions += p_positions
+            tags.update({row["id"]: p_tags[i] for row, i in zip(p_rows, p_positions) if i in p_tags})
+        rows, positions = kept_rows, kept_positions
+
+    found = []
+    for i, row in zip(positions, rows):
+        results[i] = BatchItemResult(index=i, ok=True, id=row["id"])
+        if len(row) > 1:
+            found.append(row)
+
+    if found:
+        # ORM bulk UPDATE by primary key: one executemany per distinct column set
+        try:
+            db.execute(update(model), found)
+        except IntegrityError:
+            raise HTTPException(409, "Batch would create a duplicate; nothing was updated")
+    set_project_skills(db, tags)
+    return _response(results)
+
+
+def batch_delete(db: Session, model, ids: list[int]) -> BatchResponse:
+    _check_size(len(ids))
+    existing = set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+    if existing:
+        if model in (Skill, Project):
+            untag(db, model, existing)
+        db.execute(delete(model).where(model.id.in_(existing)))
+    return _response([
+        BatchItemResult(index=i, ok=i_id in existing, id=i_id, error=None if i_id in existing else "Not found")
+        for i, i_id in enumerate(ids)
+    ])
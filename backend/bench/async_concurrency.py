@@ -0,0 +1,39 @@
+"""Compare sync (threadpool) and async (AsyncEngine) DB modes under concurrency.
+
+Starts uvicorn once per mode against the same database and hammers a read
+endpoint with N concurrent keep-alive clients. The response cache is turned
+off so every request reaches the database.
+
+    python bench/async_concurrency.py --database-url postgresql://localhost/meapi
+"""
+import argparse
+import os
+
+from common import free_port, run_load, start_server, stop_server, summarize
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--path", default="/projects?limit=50")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'clients':>8} {'req/s':>10}")
+    for db_async in (False, True):
+        port = free_port()
+        proc = start_server(args.database_url, port, DB_ASYNC="1" if db_async else "0")
+        try:
+            run_load(port, [args.path], 4, 1.0)  # warm-up
+            for n in args.concurrency:
+                samples = run_load(port, [args.path], n, args.duration)[args.path]
+                rps = summarize(samples, args.duration)["rps"]
+                print(f"{'async' if db_async else 'sync':<6} {n:>8} {rps:>10.1f}")
+        finally:
+            stop_server(proc)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
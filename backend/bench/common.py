@@ -0,0 +1,114 @@
+"""Shared helpers for the bench scripts: run the API in a subprocess and drive it over HTTP."""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int = 1, **env_overrides: str) -> subprocess.Popen:
+    """Start uvicorn on ``port`` with rate limiting and the response cache off (overridable)."""
+    env = dict(os.environ, DATABASE_URL=database_url, RATE_LIMIT="0", CACHE_TTL="0")
+    env.update(env_overrides)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning",
+         "--workers", str(workers)],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def run_load(port: int, paths: list[str], concurrency: int, duration: float,
+             headers: dict | None = None) -> dict[str, list]:
+    """Hit ``paths`` round-robin from ``concurrency`` keep-alive clients for ``duration`` seconds.
+
+    Returns {path: [(latency_seconds, status), ...]}. Each client starts at a
+    different path so every route sees the full concurrency mix.
+    """
+    samples: list[list[tuple[str, float, int]]] = [[] for _ in range(concurrency)]
+    stop = time.perf_counter() + duration
+
+    def worker(i: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        n = i
+        out = samples[i]
+        while time.perf_counter() < stop:
+            path = paths[n % len(paths)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers or {})
+                resp = conn.getresponse()
+                resp.read()
+                status = resp.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                status = 0
+            out.append((path, time.perf_counter() - start, status))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    by_path: dict[str, list] = {p: [] for p in paths}
+    for out in samples:
+        for path, latency, status in out:
+            by_path[path].append((latency, status))
+    return by_path
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: list[tuple[float, int]], duration: float) -> dict:
+    latencies = sorted(latency for latency, _ in samples)
+    ok = sum(1 for _, status in samples if 200 <= status < 400)
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - ok,
+        "rps": round(ok / duration, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
@@ -0,0 +1,173 @@
+"""Load-test the real endpoints and record RPS and p50/p95/p99 per route.
+
+For each --database-url: optionally reset and seed it (--scale), start
+uvicorn against it, warm up, then drive every route with N concurrent
+keep-alive clients. Results go to bench/results/<label>-<timestamp>.json;
+--compare prints the change against an earlier result file and exits 1 if
+any route regressed by more than --threshold.
+
+    python bench/load.py --scale 100k --label before
+    python bench/load.py --database-url postgresql://localhost/meapi_bench --scale 100k
+    python bench/load.py --compare bench/results/before-20261018-101500.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from common import BACKEND_DIR, free_port, run_load, start_server, stop_server, summarize
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "bench", "results")
+
+ROUTES = [
+    "/health",
+    "/bundle",
+    "/profile",
+    "/skills?limit=50",
+    "/skills/top?limit=10",
+    "/projects?limit=50",
+    "/projects?skill=python&limit=20",
+    "/work?limit=50",
+    "/search?q=fastapi&limit=20",
+]
+
+
+def redact(url: str) -> str:
+    return re.sub(r"://([^:/@]+):[^@]+@", r"://\1:***@", url)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def reset_and_seed(database_url: str, scale: str) -> None:
+    if database_url.startswith("sqlite:///"):
+        path = database_url[len("sqlite:///"):]
+        if not os.path.isabs(path):
+            path = os.path.join(BACKEND_DIR, path)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    else:
+        code = (
+            "from database import engine, upgrade_schema\n"
+            "from dataio import reset_data\n"
+            "upgrade_schema()\n"
+            "with engine.begin() as conn: reset_data(conn)\n"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR,
+                       env=dict(os.environ, DATABASE_URL=database_url), check=True)
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "seed.py", "--scale", scale], cwd=BACKEND_DIR,
+                   env=dict(os.environ, DATABASE_URL=database_url), check=True)
+    print(f"seeded {scale} in {time.perf_counter() - started:.1f}s", flush=True)
+
+
+def bench_database(database_url: str, args) -> dict:
+    if args.scale:
+        reset_and_seed(database_url, args.scale)
+    port = free_port()
+    env = {"DB_ASYNC": "1" if args.db_async else "0"}
+    if args.cache:
+        env["CACHE_TTL"] = "300"
+    proc = start_server(database_url, port, **env)
+    try:
+        run_load(port, args.routes, 4, args.warmup)
+        samples = run_load(port, args.routes, args.concurrency, args.duration)
+    finally:
+        stop_server(proc)
+    routes = {path: summarize(s, args.duration) for path, s in samples.items()}
+    total = summarize([x for s in samples.values() for x in s], args.duration)
+    return {"database_url": redact(database_url), "routes": routes, "total": total}
+
+
+def print_table(result: dict) -> None:
+    print(f"\n{result['database_url']}")
+    print(f"{'route':<36} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for path, r in [*result["routes"].items(), ("TOTAL", result["total"])]:
+        print(f"{path:<36} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>7}")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print per-route deltas; True if any route regressed beyond ``threshold`` (fraction)."""
+    regressed = False
+    base_runs = {r["database_url"]: r for r in baseline["runs"]}
+    for run in current["runs"]:
+        base = base_runs.get(run["database_url"])
+        if base is None:
+            continue
+        print(f"\nvs {baseline.get('label')} ({baseline.get('commit')}) on {run['database_url']}")
+        print(f"{'route':<36} {'req/s':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for path, r in run["routes"].items():
+            b = base["routes"].get(path)
+            if not b or not b["rps"] or not b["p95_ms"]:
+                continue
+            rps = r["rps"] / b["rps"] - 1
+            p95 = r["p95_ms"] / b["p95_ms"] - 1
+            p99 = r["p99_ms"] / b["p99_ms"] - 1 if b["p99_ms"] else 0.0
+            flag = ""
+            if rps < -threshold or p95 > threshold:
+                flag = "  <-- regression"
+                regressed = True
+            print(f"{path:<36} {rps:>+9.1%} {p95:>+9.1%} {p99:>+9.1%}{flag}")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", action="append",
+                        help="repeat to bench several databases (default: sqlite:///./bench.db)")
+    parser.add_argument("--scale", choices=["1k", "100k", "1m"],
+                        help="reset the database and seed this synthetic dataset first")
+    parser.add_argument("--routes", nargs="+", default=ROUTES)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--db-async", action="store_true", help="run the server with DB_ASYNC=1")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache on (off by default)")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--compare", metavar="RESULT_JSON", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed RPS drop / p95 increase before --compare fails (default 0.10)")
+    args = parser.parse_args()
+
+    result = {
+        "label": args.label,
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": args.scale,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "db_async": args.db_async,
+        "cache": args.cache,
+        "runs": [],
+    }
+    for url in args.database_url or ["sqlite:///./bench.db"]:
+        run = bench_database(url, args)
+        result["runs"].append(run)
+        print_table(run)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{args.label}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nsaved {path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
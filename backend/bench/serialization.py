@@ -0,0 +1,82 @@
+"""CPU per list page: ORM + per-object model_validate vs Core rows + TypeAdapter bytes.
+
+Runs in-process against an already seeded database (see seed.py --scale),
+no server involved. "orm" mirrors the old handlers: ORM objects, one
+model_validate per row, then FastAPI's response_model validation and the
+stdlib json encoder. "core" is the current path in serialization.py.
+
+    python bench/serialization.py --database-url sqlite:///./bench.db --limit 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def cpu_ms(fn, iterations: int) -> float:
+    fn()  # warm-up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+
+    from database import SessionLocal
+    from models import Skill, Project, Work
+    from schemas import SkillOut, ProjectOut, WorkOut
+    from serialization import (
+        SKILL_COLUMNS, PROJECT_COLUMNS, WORK_COLUMNS, skills_adapter, projects_adapter, work_adapter,
+        fetch_rows, with_project_skills, encode_page,
+    )
+
+    def orm_path(model, schema):
+        response_adapter = TypeAdapter(List[schema])
+
+        def run(db):
+            items = [schema.model_validate(o) for o in db.query(model).order_by(model.id).limit(args.limit).all()]
+            return json.dumps(response_adapter.dump_python(response_adapter.validate_python(items), mode="json")).encode()
+        return run
+
+    cases = [
+        ("skills", orm_path(Skill, SkillOut),
+         lambda db: encode_page(skills_adapter, fetch_rows(db, select(*SKILL_COLUMNS).order_by(Skill.id).limit(args.limit)))),
+        ("projects", orm_path(Project, ProjectOut),
+         lambda db: encode_page(projects_adapter, with_project_skills(
+             db, fetch_rows(db, select(*PROJECT_COLUMNS).order_by(Project.id).limit(args.limit))))),
+        ("work", orm_path(Work, WorkOut),
+         lambda db: encode_page(work_adapter, fetch_rows(db, select(*WORK_COLUMNS).order_by(Work.id).limit(args.limit)))),
+    ]
+
+    print(f"{'route':<10} {'orm ms':>9} {'core ms':>9} {'saved':>8}")
+    db = SessionLocal()
+    try:
+        for name, old, new in cases:
+            if json.loads(old(db)) != json.loads(new(db).body):
+                print(f"{name}: outputs differ", file=sys.stderr)
+                return 1
+            # expunge between runs so the ORM path pays for building objects each time
+            orm = cpu_ms(lambda: (old(db), db.expunge_all()), args.iterations)
+            core = cpu_ms(lambda: new(db), args.iterations)
+            print(f"{name:<10} {orm:>9.3f} {core:>9.3f} {1 - core / orm:>8.1%}")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Read throughput on SQLite while a writer is busy: default journal vs the tuned profile.
+
+Starts uvicorn once with SQLITE_TUNED=0 (rollback journal, readers and the
+writer share one pool) and once with SQLITE_TUNED=1 (WAL + pragmas, single
+writer + read-only pool). In each run --writers clients update skills in a
+loop while --readers clients hit the read routes.
+
+    python bench/sqlite_concurrency.py --scale 100k
+"""
+import argparse
+import http.client
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from common import BACKEND_DIR, free_port, run_load, start_server, stop_server, summarize
+from load import reset_and_seed
+
+READ_ROUTES = ["/skills?limit=50", "/projects?limit=50", "/work?limit=50", "/bundle"]
+ADMIN_HEADERS = {"X-API-Key": os.getenv("ADMIN_API_KEY", "admin 123"), "Content-Type": "application/json"}
+
+
+def write_loop(port: int, stop: threading.Event, samples: list) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    n = 0
+    while not stop.is_set():
+        n += 1
+        body = json.dumps({"proficiency": ("Advanced", "Expert")[n % 2]})
+        start = time.perf_counter()
+        try:
+            conn.request("PUT", f"/skills/{n % 50 + 1}", body=body, headers=ADMIN_HEADERS)
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            status = 0
+        samples.append((time.perf_counter() - start, status))
+
+
+def set_journal_mode(database_url: str, mode: str) -> None:
+    # WAL is stored in the file, so the default run has to switch it back
+    path = database_url.split("///", 1)[1]
+    if not os.path.isabs(path):
+        path = os.path.join(BACKEND_DIR, path)
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"PRAGMA journal_mode={mode}")
+
+
+def run(database_url: str, tuned: bool, args) -> tuple[dict, dict]:
+    set_journal_mode(database_url, "WAL" if tuned else "DELETE")
+    port = free_port()
+    proc = start_server(database_url, port, workers=args.workers, SQLITE_TUNED="1" if tuned else "0",
+                        DB_ASYNC="1" if args.db_async else "0")
+    try:
+        run_load(port, READ_ROUTES, 2, 1.0)  # warm-up
+        stop = threading.Event()
+        writes: list = []
+        writers = [threading.Thread(target=write_loop, args=(port, stop, writes)) for _ in range(args.writers)]
+        for t in writers:
+            t.start()
+        try:
+            reads = run_load(port, READ_ROUTES, args.readers, args.duration)
+        finally:
+            stop.set()
+            for t in writers:
+                t.join()
+    finally:
+        stop_server(proc)
+    return summarize([x for s in reads.values() for x in s], args.duration), summarize(writes, args.duration)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--scale", choices=["1k", "100k", "1m"], help="reset and seed the database first")
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--db-async", action="store_true")
+    args = parser.parse_args()
+
+    if args.scale:
+        reset_and_seed(args.database_url, args.scale)
+
+    print(f"{'profile':<10} {'reads/s':>9} {'read p95':>9} {'read p99':>9} {'errors':>7} {'writes/s':>9} {'write p95':>10} {'errors':>7}")
+    for tuned in (False, True):
+        reads, writes = run(args.database_url, tuned, args)
+        print(f"{'tuned' if tuned else 'default':<10} {reads['rps']:>9.1f} {reads['p95_ms']:>9.2f} {reads['p99_ms']:>9.2f} "
+              f"{reads['errors']:>7} {writes['rps']:>9.1f} {writes['p95_ms']:>10.2f} {writes['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""Cold start: process spawn -> first 200 from /health, then the first DB-backed /profile.
+
+Each run starts a fresh uvicorn process (new interpreter, empty pools) and
+polls /health every few milliseconds. Runs with AUTO_MIGRATE=1 (schema check
+at startup) and AUTO_MIGRATE=0.
+
+    python bench/startup.py --database-url sqlite:///./bench.db --runs 5
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import BACKEND_DIR, free_port, stop_server
+
+
+def get(port: int, path: str) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+    finally:
+        conn.close()
+
+
+def cold_start(database_url: str, auto_migrate: bool) -> tuple[float, float]:
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, RATE_LIMIT="0", AUTO_MIGRATE="1" if auto_migrate else "0")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        deadline = start + 60
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            if time.perf_counter() > deadline:
+                raise RuntimeError("server did not start")
+            try:
+                if get(port, "/health") == 200:
+                    break
+            except OSError:
+                time.sleep(0.005)
+        ready = time.perf_counter() - start
+        status = get(port, "/profile")
+        if status != 200:
+            raise RuntimeError(f"/profile returned {status}")
+        first_query = time.perf_counter() - start
+    finally:
+        stop_server(proc)
+    return ready, first_query
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    cold_start(args.database_url, True)  # make sure the schema is at head before timing
+    print(f"{'AUTO_MIGRATE':<13} {'/health ms (median)':>20} {'min':>8} {'/profile ms (median)':>21} {'min':>8}")
+    for auto_migrate in (True, False):
+        runs = [cold_start(args.database_url, auto_migrate) for _ in range(args.runs)]
+        ready = [r[0] * 1000 for r in runs]
+        first = [r[1] * 1000 for r in runs]
+        print(f"{int(auto_migrate):<13} {statistics.median(ready):>20.1f} {min(ready):>8.1f} "
+              f"{statistics.median(first):>21.1f} {min(first):>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))  # seconds, 0 disables
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache for read endpoints.
+
+    Every entry carries the tables it was built from ("tags"), so a write
+    only drops the entries that could have changed.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, frozenset[str], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable, count_miss: bool = True) -> Any:
+        # count_miss=False for lookups that fall back to get_or_set, which counts the miss
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += count_miss
+                return None
+            expires, _, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.misses += count_miss
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(tags), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, tags: Iterable[str], build: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return build()
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.set(key, value, tags)
+        return value
+
+    def invalidate(self, *tags: str) -> None:
+        dirty = set(tags)
+        with self._lock:
+            stale = [k for k, (_, entry_tags, _) in self._entries.items() if entry_tags & dirty]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache(CACHE_TTL, CACHE_MAX_ENTRIES)
+
+
+def invalidate_on_commit(db: Session, *tables: str) -> None:
+    """Drop cached entries built from ``tables`` once ``db`` commits.
+
+    Invalidating after the commit (not before) means a concurrent reader
+    can't re-fill the cache with pre-write rows.
+    """
+    db.info.setdefault("dirty_tables", set()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    tables = session.info.pop("dirty_tables", None)
+    if tables:
+        response_cache.invalidate(*tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("dirty_tables", None)
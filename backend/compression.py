@@ -0,0 +1,175 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+try:  # optional: `pip install brotli` adds br next to gzip
+    import brotli
+except ImportError:
+    brotli = None
+
+# Response compression negotiated from Accept-Encoding. Bodies of responses
+# that carry an ETag are compressed once per (ETag, encoding) and kept in a
+# small LRU, so cache hits on /profile etc. don't recompress identical bytes.
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # bytes, 0 disables compression
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+COMPRESS_CACHE_ENTRIES = int(os.getenv("COMPRESS_CACHE_ENTRIES", "256"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+SUPPORTED = ("br", "gzip") if brotli is not None else ("gzip",)  # server preference order
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Pick the encoding to use for an Accept-Encoding header (q=0 excludes)."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in SUPPORTED:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+class CompressedBodies:
+    """LRU of compressed bodies keyed by (ETag, encoding).
+
+    A strong ETag names exactly one body, so entries never go stale; writes
+    change the ETag and old entries simply age out.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, etag: str | None, body: bytes, encoding: str) -> bytes:
+        if etag is None or self.max_entries <= 0:
+            return compress(body, encoding)
+        key = (etag, encoding)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        data = compress(body, encoding)
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+            stored = sum(len(v) for v in self._entries.values())
+        return {
+            "encodings": list(SUPPORTED),
+            "min_size": COMPRESS_MIN_SIZE,
+            "size": size,
+            "max_entries": self.max_entries,
+            "bytes": stored,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+compressed_bodies = CompressedBodies(COMPRESS_CACHE_ENTRIES)
+
+
+def _add_vary(headers: list, value: bytes) -> list:
+    for i, (name, existing) in enumerate(headers):
+        if name.lower() == b"vary":
+            if value.lower() not in existing.lower():
+                headers[i] = (name, existing + b", " + value)
+            return headers
+    headers.append((b"vary", value))
+    return headers
+
+
+class CompressionMiddleware:
+    """gzip/br for sized text/JSON responses of at least COMPRESS_MIN_SIZE bytes.
+
+    Only responses with a Content-Length are buffered and compressed;
+    streaming ones (e.g. /export) pass through unchanged. Compressed
+    responses get a weak ETag, which If-None-Match still matches.
+    """
+
+    def __init__(self, app, min_size: int = COMPRESS_MIN_SIZE, bodies: CompressedBodies = compressed_bodies):
+        self.app = app
+        self.min_size = min_size
+        self.bodies = bodies
+
+    def _should_compress(self, start) -> bool:
+        headers = {k.lower(): v for k, v in start.get("headers", [])}
+        try:
+            length = int(headers.get(b"content-length", b""))
+        except ValueError:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        return (
+            start["status"] == 200
+            and b"content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+            and length >= self.min_size
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.min_size <= 0:
+            return await self.app(scope, receive, send)
+
+        accept = dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1")
+        encoding = negotiate(accept) if accept else None
+        start = None
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if not self._should_compress(message):
+                    return await send(message)
+                start = message  # held until the whole body is in
+                return
+            if message["type"] != "http.response.body" or start is None:
+                return await send(message)
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = _add_vary(list(start.get("headers", [])), b"Accept-Encoding")
+            if encoding is not None:
+                etag = next((v for k, v in headers if k.lower() == b"etag"), None)
+                body = self.bodies.get_or_compress(etag.decode("latin-1") if etag else None, body, encoding)
+                headers = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"etag")]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"content-length", str(len(body)).encode()))
+                if etag:
+                    headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
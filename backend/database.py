@@ -1,18 +1,514 @@
+import asyncio
+import itertools
+import logging
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event, exc, inspect, text
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./meapi.db")
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg2://", 1)
+try:  # POSIX only; without it SQLite upgrades aren't serialized across processes
+    import fcntl
+except ImportError:
+    fcntl = None
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+from profiling import profiled
+
+def normalize_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+psycopg2://", 1)
+    return url
+
+
+DATABASE_URL = normalize_url(os.getenv("DATABASE_URL", "sqlite:///./meapi.db"))
+
+# Optional read replicas (comma-separated URLs). Handlers that pass
+# read_only=True to run_db read from them round-robin; everything else, and
+# any client that wrote in the last REPLICA_PIN_SECONDS, uses the primary.
+DATABASE_REPLICA_URLS = [
+    normalize_url(u.strip()) for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+]
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
+log = logging.getLogger("meapi.db")
+
+# DB_ASYNC=1 runs handler DB work on an AsyncEngine (asyncpg / aiosqlite)
+# instead of holding a threadpool worker for the whole round-trip.
+DB_ASYNC = os.getenv("DB_ASYNC", "0").lower() in ("1", "true", "yes")
+
+def connect_args_for(url: str) -> dict:
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+
+# SQLite profile (file databases only): WAL so readers don't block on the
+# writer, cheaper fsyncs, a bigger page cache and mmap'd reads. Writes go
+# through one connection; reads get their own pool of read-only connections.
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "1").lower() in ("1", "true", "yes")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))  # 0 = reads share the writer
+
+
+def is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and "///" in url
+
+
+def to_readonly_url(url: str) -> str:
+    """sqlite:///path -> sqlite:///file:path?mode=ro&uri=true"""
+    prefix, path = url.split("///", 1)
+    return f"{prefix}///file:{path}?mode=ro&uri=true"
+
+
+def tune_sqlite(sync_engine, read_only: bool = False) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def _pragmas(dbapi_conn, record):
+        cursor = dbapi_conn.cursor()
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode=WAL")  # persistent, stored in the file
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
+SQLITE_PROFILE = SQLITE_TUNED and is_sqlite_file(DATABASE_URL)
+# separate read pool only when no real replicas take the reads
+SQLITE_READ_POOL = SQLITE_PROFILE and SQLITE_READ_POOL_SIZE > 0 and not DATABASE_REPLICA_URLS
+
+
+connect_args = connect_args_for(DATABASE_URL)
+
+# Pool sizing. Size the pool to the worker's concurrency (threadpool or
+# event loop) rather than the default 5 + 10 overflow.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))  # seconds, -1 = never
+# pre-ping costs a round-trip per checkout; with DB_POOL_RECYCLE set below the
+# server's idle timeout it can usually be turned off
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.overflow_checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.peak_checked_out = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self, pool) -> dict:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "peak_checked_out": self.peak_checked_out,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "overflow_checkouts": self.overflow_checkouts,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+        }
+
+
+class _TimedGetMixin:
+    # _do_get is where QueuePool blocks when every connection is checked out
+    stats: PoolStats | None = None
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        if self.stats is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, poolclass, size: int | None = None, overflow: int | None = None) -> dict:
+    if ":memory:" in url:
+        return {"pool_pre_ping": DB_POOL_PRE_PING}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE if size is None else size,
+        "max_overflow": DB_MAX_OVERFLOW if overflow is None else overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+pool_stats: dict[str, PoolStats] = {}
+_engines: dict[str, object] = {}
+
+
+def instrument_pool(name: str, sync_engine) -> None:
+    # listeners read sync_engine.pool each time, which stays valid after dispose()
+    stats = PoolStats()
+    sync_engine.pool.stats = stats
+    pool_stats[name] = stats
+    _engines[name] = sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        stats.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        stats.checkouts += 1
+        pool = sync_engine.pool
+        checked_out = pool.checkedout()
+        if checked_out > pool.size():
+            stats.overflow_checkouts += 1
+        if checked_out > stats.peak_checked_out:
+            stats.peak_checked_out = checked_out
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        stats.checkins += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception):
+        stats.invalidations += 1
+
+
+def pool_metrics() -> dict:
+    return {name: stats.snapshot(_engines[name].pool) for name, stats in pool_stats.items()}
+
+
+# with a SQLite read pool the primary is the single writer: one connection,
+# so writers queue in the pool instead of failing with "database is locked"
+writer_pool = {"size": 1, "overflow": 0} if SQLITE_READ_POOL else {}
 
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    pool_pre_ping=True
+    **pool_options(DATABASE_URL, InstrumentedQueuePool, **writer_pool),
 )
+if SQLITE_PROFILE:
+    tune_sqlite(engine)
+if isinstance(engine.pool, _TimedGetMixin):
+    instrument_pool("primary", engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+replica_engines = []
+for i, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    replica = create_engine(url, connect_args=connect_args_for(url), **pool_options(url, InstrumentedQueuePool))
+    if isinstance(replica.pool, _TimedGetMixin):
+        instrument_pool(f"replica{i}", replica)
+    replica_engines.append(replica)
+
+# read-only connections to the same SQLite file; they take the read_only=True
+# traffic like a replica would, but without lag (WAL readers see every commit)
+sqlite_read_engine = None
+if SQLITE_READ_POOL:
+    READ_URL = to_readonly_url(DATABASE_URL)
+    sqlite_read_engine = create_engine(
+        READ_URL,
+        connect_args=connect_args,
+        **pool_options(READ_URL, InstrumentedQueuePool, size=SQLITE_READ_POOL_SIZE),
+    )
+    tune_sqlite(sqlite_read_engine, read_only=True)
+    instrument_pool("sqlite_read", sqlite_read_engine)
+    replica_engines.append(sqlite_read_engine)
+
+
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1).replace("+pysqlite", "", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool, **writer_pool),
+    )
+    if SQLITE_PROFILE:
+        tune_sqlite(async_engine.sync_engine)
+    if isinstance(async_engine.pool, _TimedGetMixin):
+        instrument_pool("primary_async", async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+async_replica_engines = []
+if DB_ASYNC:
+    for i, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+        async_url = to_async_url(url)
+        replica = create_async_engine(async_url, **pool_options(async_url, InstrumentedAsyncQueuePool))
+        if isinstance(replica.pool, _TimedGetMixin):
+            instrument_pool(f"replica{i}_async", replica.sync_engine)
+        async_replica_engines.append(replica)
+    if SQLITE_READ_POOL:
+        ASYNC_READ_URL = to_async_url(READ_URL)
+        replica = create_async_engine(
+            ASYNC_READ_URL,
+            **pool_options(ASYNC_READ_URL, InstrumentedAsyncQueuePool, size=SQLITE_READ_POOL_SIZE),
+        )
+        tune_sqlite(replica.sync_engine, read_only=True)
+        instrument_pool("sqlite_read_async", replica.sync_engine)
+        async_replica_engines.append(replica)
+
+
+# ---- read-your-writes: clients that just wrote read from the primary ----
+current_client: ContextVar[str | None] = ContextVar("db_client", default=None)
+_pins: dict[str, float] = {}
+_pins_lock = threading.Lock()
+_next_replica = itertools.count()
+PIN_MAX_CLIENTS = 10000
+
+
+def pin_to_primary(client: str | None) -> None:
+    # only real replicas lag; the SQLite read pool sees commits immediately
+    if client is None or not DATABASE_REPLICA_URLS or REPLICA_PIN_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    with _pins_lock:
+        if len(_pins) >= PIN_MAX_CLIENTS:
+            for key in [k for k, until in _pins.items() if until <= now]:
+                del _pins[key]
+        _pins[client] = now + REPLICA_PIN_SECONDS
+
+
+def is_pinned(client: str | None) -> bool:
+    if client is None:
+        return False
+    with _pins_lock:
+        until = _pins.get(client)
+    return until is not None and until > time.monotonic()
+
+
+def pick_replica(engines: list):
+    """Round-robin over ``engines``; None when the read should go to the primary."""
+    if not engines or is_pinned(current_client.get()):
+        return None
+    return engines[next(_next_replica) % len(engines)]
+
+
+@event.listens_for(Session, "after_commit")
+def _note_write(session: Session) -> None:
+    session.info["wrote"] = True
+
+
+class ReplicaPinMiddleware:
+    """Makes the client address available to run_db for read-your-writes pinning."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        client = scope.get("client")
+        token = current_client.set(client[0] if client else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_client.reset(token)
+
+
+def _run_with_session(fn, *args, bind=None):
+    db = SessionLocal(bind=bind) if bind is not None else SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        if db.info.pop("wrote", False):
+            pin_to_primary(current_client.get())
+        db.close()
+
+
+async def _run_async(fn, *args, bind=None):
+    async with (AsyncSessionLocal(bind=bind) if bind is not None else AsyncSessionLocal()) as db:
+        try:
+            return await db.run_sync(fn, *args)
+        finally:
+            if db.sync_session.info.pop("wrote", False):
+                pin_to_primary(current_client.get())
+
+
+async def run_db(fn, *args, read_only: bool = False):
+    """Run ``fn(session, *args)`` without blocking the event loop.
+
+    ``fn`` is plain sync ORM code. In async mode it runs on the AsyncEngine
+    via ``run_sync`` (IO awaits the driver); otherwise it runs in the
+    threadpool with a regular Session, exactly like a sync ``def`` handler.
+    ``read_only=True`` lets it run on a replica (see DATABASE_REPLICA_URLS);
+    if the replica fails, the read is retried on the primary.
+    """
+    fn = profiled(fn)
+    if AsyncSessionLocal is not None:
+        replica = pick_replica(async_replica_engines) if read_only else None
+        if replica is not None:
+            try:
+                return await _run_async(fn, *args, bind=replica)
+            except exc.OperationalError as e:
+                log.warning("replica read failed, using the primary: %s", e)
+        return await _run_async(fn, *args)
+    replica = pick_replica(replica_engines) if read_only else None
+    if replica is not None:
+        try:
+            return await run_in_threadpool(_run_with_session, fn, *args, bind=replica)
+        except exc.OperationalError as e:
+            log.warning("replica read failed, using the primary: %s", e)
+    return await run_in_threadpool(_run_with_session, fn, *args)
+
+
+# arbitrary app-wide key for pg_advisory_xact_lock
+MIGRATION_LOCK_KEY = 7_302_118_554
+
+
+@contextmanager
+def migration_lock(conn):
+    """Serialize schema upgrades across workers and instances sharing the database."""
+    url = conn.engine.url
+    if conn.dialect.name == "postgresql":
+        # released when the upgrade's transaction ends
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        yield
+    elif fcntl is not None and is_sqlite_file(str(url)):
+        with open(f"{url.database}.migrate.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        yield
+
+
+def upgrade_schema(target_engine=None) -> None:
+    """Apply pending Alembic migrations (backend/migrations) to ``target_engine``.
+
+    Holds migration_lock, so concurrent callers wait; whoever comes second
+    finds the schema at head and does nothing.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    with (target_engine or engine).begin() as conn, migration_lock(conn):
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "head")
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations", "versions")
+
+
+def head_revisions() -> set[str]:
+    """Heads of the migration graph, read from the revision files without importing Alembic."""
+    revisions, parents = set(), set()
+    for name in os.listdir(MIGRATIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, name), encoding="utf-8") as f:
+            source = f.read()
+        rev = re.search(r"^revision\s*=\s*['\"]([^'\"]+)", source, flags=re.M)
+        down = re.search(r"^down_revision\s*=\s*(.+)$", source, flags=re.M)
+        if rev:
+            revisions.add(rev.group(1))
+        if down:
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", down.group(1)))
+    return revisions - parents
+
+
+def schema_is_current(conn) -> bool:
+    if not inspect(conn).has_table("alembic_version"):
+        return False
+    current = set(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    return current == head_revisions()
+
+
+def migrate_if_needed(target_engine=None) -> bool:
+    """Run upgrade_schema only if the database isn't at head; True if it ran.
+
+    The check is one query, so a normal restart doesn't import Alembic at all.
+    """
+    target_engine = target_engine or engine
+    with target_engine.connect() as conn:
+        if schema_is_current(conn):
+            return False
+    upgrade_schema(target_engine)
+    return True
+
+
+# open a few connections per pool in the background after startup, so the
+# first requests don't pay for connection setup (TLS + auth on Postgres)
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "2"))  # connections per pool, 0 disables
+
+
+def _warm_sync(sync_engine, n: int) -> None:
+    conns = []
+    try:
+        for _ in range(min(n, sync_engine.pool.size())):
+            conns.append(sync_engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+async def _warm_async(async_eng, n: int) -> None:
+    conns = []
+    try:
+        for _ in range(min(n, async_eng.pool.size())):
+            conns.append(await async_eng.connect())
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+async def warm_pools(n: int = DB_POOL_WARM) -> None:
+    if n <= 0:
+        return
+    jobs = [run_in_threadpool(_warm_sync, e, n) for e in [engine, *replica_engines] if hasattr(e.pool, "size")]
+    jobs += [_warm_async(e, n) for e in [async_engine, *async_replica_engines] if e is not None and hasattr(e.pool, "size")]
+    for result in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(result, Exception):
+            log.warning("pool warm-up failed: %s", result)
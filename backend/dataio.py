@@ -0,0 +1,131 @@
+import io
+import json
+import os
+
+from sqlalchemy import delete, exists, insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from models import Profile, Skill, Project, Work, project_skills, proficiency_score
+
+# NDJSON dump format: one {"table": ..., "row": {...}} object per line, tables
+# in foreign-key order so a dump can be replayed top to bottom.
+EXPORT_MODELS = [Profile, Skill, Project, Work]
+TABLES = {m.__tablename__: m.__table__ for m in EXPORT_MODELS}
+TABLES[project_skills.name] = project_skills
+
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+
+def export_ndjson(engine):
+    """Yield the whole dataset as NDJSON lines with constant memory.
+
+    Uses a server-side cursor (stream_results) and fetches ``yield_per``
+    rows at a time, so no table is ever fully loaded. All tables are read
+    from one snapshot, so writes during the dump can't leave rows pointing
+    at parents that aren't in the file.
+    """
+    with engine.connect() as conn:
+        options = {"stream_results": True, "yield_per": EXPORT_YIELD_PER}
+        if conn.dialect.name == "postgresql":
+            options["isolation_level"] = "REPEATABLE READ"
+        conn = conn.execution_options(**options)
+        if conn.dialect.name == "sqlite":
+            # pysqlite doesn't BEGIN before a SELECT, so each table would be
+            # its own snapshot; hold one read transaction for the whole stream
+            conn.exec_driver_sql("BEGIN")
+        for name, table in TABLES.items():
+            result = conn.execute(select(table).order_by(*table.primary_key.columns))
+            for row in result.mappings():
+                yield json.dumps({"table": name, "row": dict(row)}, default=str).encode() + b"\n"
+
+
+class DumpFormatError(ValueError):
+    pass
+
+
+def parse_line(line: bytes, lineno: int) -> tuple[str, dict]:
+    try:
+        obj = json.loads(line)
+        name, row = obj["table"], obj["row"]
+    except (ValueError, KeyError, TypeError):
+        raise DumpFormatError(f"line {lineno}: expected {{\"table\": ..., \"row\": {{...}}}}")
+    table = TABLES.get(name)
+    if table is None or not isinstance(row, dict):
+        raise DumpFormatError(f"line {lineno}: unknown table {name!r}")
+    row = {k: v for k, v in row.items() if k in table.c}
+    if name == "skills" and "score" not in row:
+        # dumps taken before skills.score existed
+        row["score"] = proficiency_score(row.get("proficiency"))
+    return name, row
+
+
+async def iter_lines(stream):
+    """Split an async byte stream into non-empty lines (numbered from 1)."""
+    buf = b""
+    lineno = 0
+    async for chunk in stream:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            lineno += 1
+            if line.strip():
+                yield lineno, line
+    if buf.strip():
+        yield lineno + 1, buf
+
+
+def is_empty(db: Session) -> bool:
+    # one round-trip of EXISTS probes instead of a COUNT(*) per table
+    return not db.execute(select(or_(*(exists(table.select()) for table in TABLES.values())))).scalar()
+
+
+def reset_data(db: Session) -> None:
+    for table in reversed(TABLES.values()):
+        db.execute(delete(table))
+
+
+def insert_batch(db: Session, name: str, rows: list[dict]) -> None:
+    db.execute(insert(TABLES[name]), rows)
+
+
+def reset_sequences(conn) -> None:
+    """Move Postgres id sequences past rows that were inserted with explicit ids."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in (name for name, t in TABLES.items() if "id" in t.c):
+        conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 0) FROM {table}), true)"
+            )
+        )
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(conn, table, rows) -> None:
+    """Load rows with Postgres COPY (text format) on the connection's transaction."""
+    columns = [c.name for c in table.columns]
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_value(row[c]) for c in columns))
+        buf.write("\n")
+    buf.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buf)
+    finally:
+        cursor.close()
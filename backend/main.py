@@ -1,19 +1,72 @@
+import asyncio
+import math
 import os
-import time
-from fastapi import FastAPI, Depends, HTTPException, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List
 from fastapi import Header
 
-from database import SessionLocal, engine
-from models import Base, Profile, Skill, Project, Work
-from schemas import *
+from database import (
+    engine, async_engine, replica_engines, async_replica_engines, sqlite_read_engine, run_db, pool_metrics,
+    migrate_if_needed, warm_pools, ReplicaPinMiddleware, current_client, is_pinned,
+)
+from models import Profile, Skill, Project, Work
+from schemas import (
+    ProfileCreate, ProfileUpdate, ProfileOut,
+    WorkCreate, WorkUpdate, WorkOut,
+    SkillCreate, SkillUpdate, SkillOut,
+    ProjectCreate, ProjectUpdate, ProjectOut,
+    BundleOut, SearchResults, BatchResponse,
+)
+from search import search_skills, search_projects
+from cache import response_cache, invalidate_on_commit
+from versions import TRACKED_TABLES, ensure_versions, bump_versions, table_etag, snapshot_etag, conditional_get
+from pagination import decode_cursor, set_next_cursor, paginate
+from serialization import (
+    SKILL_COLUMNS, PROJECT_COLUMNS, WORK_COLUMNS, skills_adapter, projects_adapter, work_adapter,
+    fetch_rows, with_project_skills, encode_page, profile_document, encode_profile, json_response,
+    BUNDLE_SECTIONS, bundle_document, encode_bundle,
+)
+from ratelimit import build_backend
+from metrics import metrics, instrument_engine, MetricsMiddleware
+from profiling import profile_store, log_slow_queries, ProfilingMiddleware
+from compression import compressed_bodies, CompressionMiddleware
+from batch import batch_create, batch_update, batch_delete
+from tags import skills_for, projects_using
+from dataio import (
+    TABLES, IMPORT_BATCH_SIZE, DumpFormatError,
+    export_ndjson, iter_lines, parse_line, is_empty, reset_data, insert_batch, reset_sequences,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
 
+# schema is owned by Alembic (backend/migrations); AUTO_MIGRATE=0 leaves it
+# to `alembic upgrade head` run as a deploy step
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "1").lower() in ("1", "true", "yes")
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+def prepare_database():
+    if AUTO_MIGRATE:
+        migrate_if_needed()  # one query when already at head; Alembic is imported only to upgrade
+    with engine.begin() as conn:
+        ensure_versions(conn)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # nothing touches the database at import time; uvicorn runs this before serving
+    await run_in_threadpool(prepare_database)
+    warm = asyncio.create_task(warm_pools())
+    yield
+    warm.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "admin 123")   # simple on purpose (demo)
 DEFAULT_PROFILE = {
     "name": "K V Dheeraj Reddy",
@@ -26,12 +79,29 @@ def verify_admin(x_api_key: str = Header(None)):
     if x_api_key != ADMIN_API_KEY:
         raise HTTPException(status_code=401, detail="Unauthorized")
     return x_api_key
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def mark_changed(db: Session, *tables: str):
+    # call before commit: bumps ETag versions in the same transaction and
+    # drops cached responses once it commits
+    bump_versions(db, *tables)
+    invalidate_on_commit(db, *tables)
+
+
+def from_memory(request: Request, response: Response, send, tables, *key) -> Response | None:
+    """A 304 or the cached response while this process's table versions are fresh.
+
+    No session is checked out; None means go to the database (run_db). Clients
+    pinned to the primary after a write always go there.
+    """
+    if is_pinned(current_client.get()):
+        return None
+    etag = snapshot_etag(tables, *key)
+    if etag is None:
+        return None
+    not_modified = conditional_get(request, response, etag)
+    if not_modified or send is None:
+        return not_modified
+    cached = response_cache.get(etag, count_miss=False)
+    return send(cached) if cached is not None else None
 
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
 if CORS_ORIGINS == "*":
@@ -47,268 +117,733 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],  # GET, POST, PATCH, DELETE, OPTIONS
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Profile-Id"],
 )
 
-# ---------------- RATE LIMIT (SIMPLE, IN-MEMORY) ----------------
+# ---------------- RATE LIMIT (TOKEN BUCKET) ----------------
 RATE_LIMIT = int(os.getenv("RATE_LIMIT", "60"))  # requests
 RATE_WINDOW = int(os.getenv("RATE_WINDOW", "60"))  # seconds
-_rate_state: dict[str, dict[str, float]] = {}
+rate_limiter = build_backend(RATE_LIMIT, RATE_WINDOW) if RATE_LIMIT > 0 and RATE_WINDOW > 0 else None
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
-    if RATE_LIMIT <= 0 or RATE_WINDOW <= 0:
+    if rate_limiter is None:
         return await call_next(request)
 
     client = request.client.host if request.client else "unknown"
-    now = time.time()
-    state = _rate_state.get(client)
-    if not state or now - state["start"] > RATE_WINDOW:
-        _rate_state[client] = {"start": now, "count": 1}
-        return await call_next(request)
-
-    if state["count"] >= RATE_LIMIT:
-        raise HTTPException(status_code=429, detail="Too Many Requests")
+    retry_after = await rate_limiter.hit(client)
+    if retry_after > 0:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too Many Requests"},
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
 
-    state["count"] += 1
     return await call_next(request)
 
 
+# ---------------- READ REPLICAS ----------------
+# tells run_db who is asking, so a client's reads stick to the primary right after it writes
+app.add_middleware(ReplicaPinMiddleware)
+
+
+# ---------------- COMPRESSION ----------------
+# inside profiling/metrics, so their timings include compression
+app.add_middleware(CompressionMiddleware)
+
+
+# ---------------- PROFILING ----------------
+def is_admin_key(api_key: str | None) -> bool:
+    try:
+        verify_admin(api_key)
+    except HTTPException:
+        return False
+    return True
+
+
+log_slow_queries(engine)
+if async_engine is not None:
+    log_slow_queries(async_engine.sync_engine)
+for replica in [*replica_engines, *(e.sync_engine for e in async_replica_engines)]:
+    log_slow_queries(replica)
+app.add_middleware(ProfilingMiddleware, is_admin=is_admin_key)
+
+
+@app.get("/debug/profiles")
+def list_profiles(_: str = Depends(verify_admin)):
+    return profile_store.list()
+
+
+@app.get("/debug/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile_report(profile_id: int, _: str = Depends(verify_admin)):
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(404, "Profile not found (only the last PROFILE_KEEP are kept)")
+    head = f"{report['method']} {report['path']}?{report['query']} -> {report['status']} in {report['ms']}ms\n\n"
+    return PlainTextResponse(head + report["stats"])
+
+
+# ---------------- METRICS ----------------
+# added last, so it is the outermost middleware and also sees 429s
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+for replica in [*replica_engines, *(e.sync_engine for e in async_replica_engines)]:
+    instrument_engine(replica)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics(_: str = Depends(verify_admin)):
+    return PlainTextResponse(
+        metrics.render(response_cache.stats(), pool_metrics()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+
+@app.get("/stats/cache")
+def cache_stats(_: str = Depends(verify_admin)):
+    return response_cache.stats()
+
+
+@app.get("/stats/pool")
+def db_pool_stats(_: str = Depends(verify_admin)):
+    return pool_metrics()
+
+
+@app.get("/stats/compression")
+def compression_stats(_: str = Depends(verify_admin)):
+    return compressed_bodies.stats()
+
 # ---------------- PROFILE ----------------
 
 @app.post("/profile", response_model=ProfileOut)
-def create_profile(profile: ProfileCreate, db: Session = Depends(get_db)):
-    if db.query(Profile).first():
-        raise HTTPException(400, "Profile already exists")
+async def create_profile(profile: ProfileCreate):
+    def create(db: Session):
+        if db.query(Profile).first():
+            raise HTTPException(400, "Profile already exists")
+
+        p = Profile(**profile.model_dump())
+        db.add(p)
+        mark_changed(db, "profiles")
+        db.commit()
+        db.refresh(p)
+        return ProfileOut.model_validate(p)
 
-    p = Profile(**profile.model_dump())
-    db.add(p)
-    db.commit()
-    db.refresh(p)
-    return p
+    return await run_db(create)
 
 
-@app.get("/profile", response_model=ProfileOut)
-def get_profile(db: Session = Depends(get_db)):
-    profile = db.query(Profile).first()
-    if not profile:
-        profile = Profile(**DEFAULT_PROFILE)
-        db.add(profile)
+PROFILE_TABLES = ("profiles", "skills", "projects", "work")
+
+
+def create_default_profile(db: Session):
+    if db.query(Profile.id).first() is None:
+        db.add(Profile(**DEFAULT_PROFILE))
+        mark_changed(db, "profiles")
         db.commit()
-        db.refresh(profile)
-    return profile
+
+
+@app.get("/profile", response_model=ProfileOut)
+async def get_profile(request: Request, response: Response):
+    def load(db: Session):
+        etag = table_etag(db, PROFILE_TABLES, "profile")
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+
+        def build():
+            # one query per collection, straight to dicts
+            doc = profile_document(db)
+            return encode_profile(doc) if doc is not None else None
+
+        body = response_cache.get_or_set(etag, PROFILE_TABLES, build)
+        return send(body) if body is not None else None
+
+    def send(body: bytes):
+        return json_response(response, body)
+
+    hit = from_memory(request, response, send, PROFILE_TABLES, "profile")
+    result = hit or await run_db(load, read_only=True)
+    if result is None:
+        # first visit: create the default profile on the primary, then read it back there
+        await run_db(create_default_profile)
+        result = await run_db(load)
+    return result
 
 
 # 🔥 PATCH added (matches frontend)
 @app.patch("/profile", response_model=ProfileOut)
-def update_profile(data: ProfileUpdate, db: Session = Depends(get_db), _: str = Depends(verify_admin)):
-    profile = db.query(Profile).first()
-    if not profile:
-        raise HTTPException(404)
+async def update_profile(data: ProfileUpdate, _: str = Depends(verify_admin)):
+    def update(db: Session):
+        profile = db.query(Profile).first()
+        if not profile:
+            raise HTTPException(404)
 
-    for k, v in data.model_dump(exclude_unset=True).items():
-        setattr(profile, k, v)
+        for k, v in data.model_dump(exclude_unset=True).items():
+            setattr(profile, k, v)
 
-    db.commit()
-    db.refresh(profile)
-    return profile
+        mark_changed(db, "profiles")
+        db.commit()
+        db.refresh(profile)
+        return ProfileOut.model_validate(profile)
+
+    return await run_db(update)
 
 
 # ---------------- WORK ----------------
 
 @app.post("/work", response_model=WorkOut)
-def add_work(work: WorkCreate, db: Session = Depends(get_db), _: str = Depends(verify_admin)):
-    profile = db.query(Profile).first()
-    if not profile:
-        raise HTTPException(400, "Create profile first")
-
-    w = Work(
-        company=work.company,
-        role=work.role,
-        start_date=work.start_date,
-        end_date=work.end_date,
-        description=work.description,
-        profile_id=profile.id
-    )
-    db.add(w)
-    db.commit()
-    db.refresh(w)
-    return w
+async def add_work(work: WorkCreate, _: str = Depends(verify_admin)):
+    def create(db: Session):
+        profile = db.query(Profile).first()
+        if not profile:
+            raise HTTPException(400, "Create profile first")
+
+        w = Work(
+            company=work.company,
+            role=work.role,
+            start_date=work.start_date,
+            end_date=work.end_date,
+            description=work.description,
+            profile_id=profile.id
+        )
+        db.add(w)
+        mark_changed(db, "work")
+        db.commit()
+        db.refresh(w)
+        return WorkOut.model_validate(w)
+
+    return await run_db(create)
 
 
 @app.get("/work", response_model=List[WorkOut])
-def get_work(limit: int = 50, offset: int = 0, db: Session = Depends(get_db)):
+async def get_work(
+    request: Request,
+    response: Response,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
-    return db.query(Work).offset(offset).limit(limit).all()
+    after = decode_cursor(cursor) if cursor else None
+
+    def load(db: Session):
+        etag = table_etag(db, ("work",), "work", limit, offset, after)
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+        page = response_cache.get_or_set(
+            etag,
+            ("work",),
+            lambda: encode_page(
+                work_adapter, fetch_rows(db, paginate(select(*WORK_COLUMNS), Work.id, limit, offset, after))
+            ),
+        )
+        return send(page)
+
+    def send(page):
+        set_next_cursor(response, page, limit)
+        return json_response(response, page.body)
+
+    hit = from_memory(request, response, send, ("work",), "work", limit, offset, after)
+    return hit or await run_db(load, read_only=True)
 
 
 @app.put("/work/{work_id}", response_model=WorkOut)
-def update_work(work_id: int, data: WorkUpdate, db: Session = Depends(get_db)):
-    work = db.get(Work, work_id)
-    if not work:
-        raise HTTPException(404)
+async def update_work(work_id: int, data: WorkUpdate):
+    def update(db: Session):
+        work = db.get(Work, work_id)
+        if not work:
+            raise HTTPException(404)
 
-    for k, v in data.model_dump(exclude_unset=True).items():
-        setattr(work, k, v)
+        for k, v in data.model_dump(exclude_unset=True).items():
+            setattr(work, k, v)
 
-    db.commit()
-    db.refresh(work)
-    return work
+        mark_changed(db, "work")
+        db.commit()
+        db.refresh(work)
+        return WorkOut.model_validate(work)
+
+    return await run_db(update)
 
 
 @app.delete("/work/{work_id}")
-def delete_work(work_id: int, db: Session = Depends(get_db), _: str = Depends(verify_admin)):
-    work = db.get(Work, work_id)
-    if not work:
-        raise HTTPException(404)
+async def delete_work(work_id: int, _: str = Depends(verify_admin)):
+    def delete(db: Session):
+        work = db.get(Work, work_id)
+        if not work:
+            raise HTTPException(404)
+
+        db.delete(work)
+        mark_changed(db, "work")
+        db.commit()
+        return {"ok": True}
 
-    db.delete(work)
-    db.commit()
-    return {"ok": True}
+    return await run_db(delete)
 
 
 # ---------------- SKILLS ----------------
 
 @app.post("/skills", response_model=SkillOut)
-def create_skill(
+async def create_skill(
     skill: SkillCreate,
-    db: Session = Depends(get_db),
     user: str = Depends(verify_admin)   # if you have admin auth
 ):
-    profile = db.query(Profile).first()
-    if not profile:
-        raise HTTPException(400, "Create profile first")
-
-    db_skill = Skill(
-        name=skill.name,
-        proficiency=skill.proficiency,
-        profile_id=profile.id   # or however you link profile
-    )
+    def create(db: Session):
+        profile = db.query(Profile).first()
+        if not profile:
+            raise HTTPException(400, "Create profile first")
+
+        db_skill = Skill(
+            name=skill.name,
+            proficiency=skill.proficiency,
+            profile_id=profile.id   # or however you link profile
+        )
+
+        db.add(db_skill)
+        mark_changed(db, "skills")
+        try:
+            db.commit()
+        except IntegrityError:
+            raise HTTPException(409, "Skill already exists")
+        db.refresh(db_skill)
+        return SkillOut.model_validate(db_skill)
 
-    db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
-    return db_skill
+    return await run_db(create)
 
 
 @app.get("/skills", response_model=List[SkillOut])
-def get_skills(limit: int = 50, offset: int = 0, db: Session = Depends(get_db)):
+async def get_skills(
+    request: Request,
+    response: Response,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
-    return db.query(Skill).offset(offset).limit(limit).all()
+    after = decode_cursor(cursor) if cursor else None
+
+    def load(db: Session):
+        etag = table_etag(db, ("skills",), "skills", limit, offset, after)
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+        page = response_cache.get_or_set(
+            etag,
+            ("skills",),
+            lambda: encode_page(
+                skills_adapter, fetch_rows(db, paginate(select(*SKILL_COLUMNS), Skill.id, limit, offset, after))
+            ),
+        )
+        return send(page)
+
+    def send(page):
+        set_next_cursor(response, page, limit)
+        return json_response(response, page.body)
+
+    hit = from_memory(request, response, send, ("skills",), "skills", limit, offset, after)
+    return hit or await run_db(load, read_only=True)
 
 
 @app.get("/skills/top", response_model=List[SkillOut])
-def get_top_skills(limit: int = 5, db: Session = Depends(get_db)):
+async def get_top_skills(request: Request, response: Response, limit: int = 5):
     limit = max(1, min(limit, 50))
-    return db.query(Skill).order_by(Skill.name.asc()).limit(limit).all()
+
+    def load(db: Session):
+        etag = table_etag(db, ("skills",), "skills/top", limit)
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+        top = (
+            select(*SKILL_COLUMNS)
+            .where(Skill.profile_id == select(Profile.id).order_by(Profile.id).limit(1).scalar_subquery())
+            .order_by(Skill.score.desc(), Skill.id.desc())
+            .limit(limit)
+        )
+        page = response_cache.get_or_set(etag, ("skills",), lambda: encode_page(skills_adapter, fetch_rows(db, top)))
+        return send(page)
+
+    def send(page):
+        return json_response(response, page.body)
+
+    hit = from_memory(request, response, send, ("skills",), "skills/top", limit)
+    return hit or await run_db(load, read_only=True)
 
 
 @app.put("/skills/{skill_id}", response_model=SkillOut)
-def update_skill(
-    skill_id: int,
-    data: SkillUpdate,
-    db: Session = Depends(get_db)
-):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
-    if not skill:
-        raise HTTPException(status_code=404, detail="Skill not found")
+async def update_skill(skill_id: int, data: SkillUpdate):
+    def update(db: Session):
+        skill = db.query(Skill).filter(Skill.id == skill_id).first()
+        if not skill:
+            raise HTTPException(status_code=404, detail="Skill not found")
+
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(skill, key, value)
 
-    for key, value in data.model_dump(exclude_unset=True).items():
-        setattr(skill, key, value)
+        mark_changed(db, "skills", "projects")  # project tags show skill names
+        try:
+            db.commit()
+        except IntegrityError:
+            raise HTTPException(409, "Skill already exists")
+        db.refresh(skill)
+        return SkillOut.model_validate(skill)
 
-    db.commit()
-    db.refresh(skill)
-    return skill
+    return await run_db(update)
 
 @app.delete("/skills/{skill_id}")
-def delete_skill(skill_id: int, db: Session = Depends(get_db), _: str = Depends(verify_admin)):
-    skill = db.get(Skill, skill_id)
-    if not skill:
-        raise HTTPException(404)
+async def delete_skill(skill_id: int, _: str = Depends(verify_admin)):
+    def delete(db: Session):
+        skill = db.get(Skill, skill_id)
+        if not skill:
+            raise HTTPException(404)
+
+        db.delete(skill)
+        mark_changed(db, "skills", "projects")
+        db.commit()
+        return {"ok": True}
 
-    db.delete(skill)
-    db.commit()
-    return {"ok": True}
+    return await run_db(delete)
 
 
 # ---------------- PROJECTS ----------------
 
 @app.post("/projects", response_model=ProjectOut)
-def add_project(project: ProjectCreate, db: Session = Depends(get_db), _: str = Depends(verify_admin)):
-    profile = db.query(Profile).first()
-    if not profile:
-        raise HTTPException(400, "Create profile first")
-
-    p = Project(
-        title=project.title,
-        description=project.description,
-        links=project.links,      # 🔥 explicit
-        profile_id=profile.id
-    )
-    db.add(p)
-    db.commit()
-    db.refresh(p)
-    return p
+async def add_project(project: ProjectCreate, _: str = Depends(verify_admin)):
+    def create(db: Session):
+        profile = db.query(Profile).first()
+        if not profile:
+            raise HTTPException(400, "Create profile first")
+
+        p = Project(
+            title=project.title,
+            description=project.description,
+            links=project.links,      # 🔥 explicit
+            profile_id=profile.id
+        )
+        if project.skills:
+            p.skills = skills_for(db, profile.id, project.skills)
+        db.add(p)
+        mark_changed(db, "projects")
+        db.commit()
+        db.refresh(p)
+        return ProjectOut.model_validate(p)
+
+    return await run_db(create)
 
 
 @app.get("/projects", response_model=List[ProjectOut])
-def get_projects(skill: str | None = None, limit: int = 50, offset: int = 0, db: Session = Depends(get_db)):
-    query = db.query(Project)
+async def get_projects(
+    request: Request,
+    response: Response,
+    skill: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
-    if skill:
-        query = (
-            db.query(Project)
-            .join(Profile, Project.profile_id == Profile.id)
-            .join(Skill, Skill.profile_id == Profile.id)
-            .filter(Skill.name.ilike(f"%{skill}%"))
-            .distinct()
+    after = decode_cursor(cursor) if cursor else None
+    tables = ("projects", "skills") if skill else ("projects",)
+
+    def load(db: Session):
+        etag = table_etag(db, tables, "projects", skill, limit, offset, after)
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+        query = select(*PROJECT_COLUMNS)
+        if skill:
+            query = query.where(projects_using(skill))
+        page = response_cache.get_or_set(
+            etag,
+            tables,
+            lambda: encode_page(
+                projects_adapter,
+                with_project_skills(db, fetch_rows(db, paginate(query, Project.id, limit, offset, after))),
+            ),
         )
-    return query.offset(offset).limit(limit).all()
+        return send(page)
 
+    def send(page):
+        set_next_cursor(response, page, limit)
+        return json_response(response, page.body)
 
-@app.put("/projects/{project_id}", response_model=ProjectOut)
-def update_project(project_id: int, data: ProjectUpdate, db: Session = Depends(get_db)):
-    project = db.get(Project, project_id)
-    if not project:
-        raise HTTPException(404)
+    hit = from_memory(request, response, send, tables, "projects", skill, limit, offset, after)
+    return hit or await run_db(load, read_only=True)
 
-    for k, v in data.model_dump(exclude_unset=True).items():
-        setattr(project, k, v)
 
-    db.commit()
-    db.refresh(project)
-    return project
+@app.put("/projects/{project_id}", response_model=ProjectOut)
+async def update_project(project_id: int, data: ProjectUpdate):
+    def update(db: Session):
+        project = db.get(Project, project_id)
+        if not project:
+            raise HTTPException(404)
+
+        changes = data.model_dump(exclude_unset=True)
+        names = changes.pop("skills", None)
+        for k, v in changes.items():
+            setattr(project, k, v)
+        if names is not None:
+            project.skills = skills_for(db, project.profile_id, names)
+
+        mark_changed(db, "projects")
+        db.commit()
+        db.refresh(project)
+        return ProjectOut.model_validate(project)
+
+    return await run_db(update)
 
 
 @app.delete("/projects/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db),_: str = Depends(verify_admin)):
-    project = db.get(Project, project_id)
-    if not project:
-        raise HTTPException(404)
+async def delete_project(project_id: int, _: str = Depends(verify_admin)):
+    def delete(db: Session):
+        project = db.get(Project, project_id)
+        if not project:
+            raise HTTPException(404)
+
+        db.delete(project)
+        mark_changed(db, "projects")
+        db.commit()
+        return {"ok": True}
+
+    return await run_db(delete)
 
-    db.delete(project)
-    db.commit()
-    return {"ok": True}
+
+# ---------------- BUNDLE ----------------
+# everything the portfolio page needs in one round trip
+
+@app.get("/bundle", response_model=BundleOut)
+async def get_bundle(request: Request, response: Response, sections: str | None = None, limit: int = 50):
+    limit = max(1, min(limit, 100))
+    wanted = {s.strip().lower() for s in sections.split(",") if s.strip()} if sections else set(BUNDLE_SECTIONS)
+    unknown = wanted - set(BUNDLE_SECTIONS)
+    if unknown:
+        raise HTTPException(400, f"Unknown sections: {', '.join(sorted(unknown))}")
+    wanted = tuple(s for s in BUNDLE_SECTIONS if s in wanted)  # canonical order for the ETag
+    tables = tuple(t for s in wanted for t in BUNDLE_SECTIONS[s])
+
+    def load(db: Session):
+        etag = table_etag(db, tables, "bundle", wanted, limit)
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+        def build():
+            doc = bundle_document(db, wanted, limit)
+            if "profile" in doc and doc["profile"] is None:
+                return None
+            return encode_bundle(doc)
+
+        body = response_cache.get_or_set(etag, tables, build)
+        return send(body) if body is not None else None
+
+    def send(body: bytes):
+        return json_response(response, body)
+
+    hit = from_memory(request, response, send, tables, "bundle", wanted, limit)
+    result = hit or await run_db(load, read_only=True)
+    if result is None:
+        # the page loads through /bundle, so it creates the default profile like GET /profile
+        await run_db(create_default_profile)
+        result = await run_db(load)
+    return result
+
+
+# ---------------- BATCH ----------------
+# One transaction per call; each item is validated on its own and reported
+# in `results`, so one bad row doesn't sink the rest.
+
+@app.post("/skills:batch", response_model=BatchResponse)
+async def create_skills_batch(items: List[Dict[str, Any]], _: str = Depends(verify_admin)):
+    def create(db: Session):
+        result = batch_create(db, Skill, SkillCreate, items, unique_field="name")
+        mark_changed(db, "skills")
+        db.commit()
+        return result
+
+    return await run_db(create)
+
+
+@app.patch("/skills:batch", response_model=BatchResponse)
+async def update_skills_batch(items: List[Dict[str, Any]], _: str = Depends(verify_admin)):
+    def update(db: Session):
+        result = batch_update(db, Skill, SkillUpdate, items)
+        mark_changed(db, "skills", "projects")
+        db.commit()
+        return result
+
+    return await run_db(update)
+
+
+@app.delete("/skills:batch", response_model=BatchResponse)
+async def delete_skills_batch(ids: List[int] = Query(...), _: str = Depends(verify_admin)):
+    def delete(db: Session):
+        result = batch_delete(db, Skill, ids)
+        mark_changed(db, "skills", "projects")
+        db.commit()
+        return result
+
+    return await run_db(delete)
+
+
+@app.post("/projects:batch", response_model=BatchResponse)
+async def create_projects_batch(items: List[Dict[str, Any]], _: str = Depends(verify_admin)):
+    def create(db: Session):
+        result = batch_create(db, Project, ProjectCreate, items)
+        mark_changed(db, "projects")
+        db.commit()
+        return result
+
+    return await run_db(create)
+
+
+@app.patch("/projects:batch", response_model=BatchResponse)
+async def update_projects_batch(items: List[Dict[str, Any]], _: str = Depends(verify_admin)):
+    def update(db: Session):
+        result = batch_update(db, Project, ProjectUpdate, items)
+        mark_changed(db, "projects")
+        db.commit()
+        return result
+
+    return await run_db(update)
+
+
+@app.delete("/projects:batch", response_model=BatchResponse)
+async def delete_projects_batch(ids: List[int] = Query(...), _: str = Depends(verify_admin)):
+    def delete(db: Session):
+        result = batch_delete(db, Project, ids)
+        mark_changed(db, "projects")
+        db.commit()
+        return result
+
+    return await run_db(delete)
+
+
+@app.post("/work:batch", response_model=BatchResponse)
+async def create_work_batch(items: List[Dict[str, Any]], _: str = Depends(verify_admin)):
+    def create(db: Session):
+        result = batch_create(db, Work, WorkCreate, items)
+        mark_changed(db, "work")
+        db.commit()
+        return result
+
+    return await run_db(create)
+
+
+@app.patch("/work:batch", response_model=BatchResponse)
+async def update_work_batch(items: List[Dict[str, Any]], _: str = Depends(verify_admin)):
+    def update(db: Session):
+        result = batch_update(db, Work, WorkUpdate, items)
+        mark_changed(db, "work")
+        db.commit()
+        return result
+
+    return await run_db(update)
+
+
+@app.delete("/work:batch", response_model=BatchResponse)
+async def delete_work_batch(ids: List[int] = Query(...), _: str = Depends(verify_admin)):
+    def delete(db: Session):
+        result = batch_delete(db, Work, ids)
+        mark_changed(db, "work")
+        db.commit()
+        return result
+
+    return await run_db(delete)
+
+
+# ---------------- EXPORT / IMPORT ----------------
+
+@app.get("/export")
+def export_data(_: str = Depends(verify_admin)):
+    # sync generator: Starlette drains it in the threadpool, one yield_per
+    # chunk at a time; on SQLite it reads from the read pool, not the writer
+    return StreamingResponse(
+        export_ndjson(sqlite_read_engine or engine),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="meapi-export.ndjson"'},
+    )
+
+
+# project_skills has no version of its own: tags are part of project responses
+VERSIONED_AS = {"project_skills": "projects"}
+
+
+@app.post("/import")
+async def import_data(request: Request, reset: bool = False, _: str = Depends(verify_admin)):
+    def prepare(db: Session):
+        if reset:
+            reset_data(db)
+            mark_changed(db, *TRACKED_TABLES)
+            db.commit()
+        elif not is_empty(db):
+            raise HTTPException(409, "Database is not empty; pass ?reset=true to replace it")
+
+    def flush(db: Session, name: str, rows: list[dict]):
+        insert_batch(db, name, rows)
+        mark_changed(db, VERSIONED_AS.get(name, name))
+        db.commit()
+
+    def finish(db: Session):
+        reset_sequences(db.connection())
+        db.commit()
+
+    await run_db(prepare)
+    imported = dict.fromkeys(TABLES, 0)
+    batch_table, batch = None, []
+    try:
+        async for lineno, line in iter_lines(request.stream()):
+            table, row = parse_line(line, lineno)
+            if batch and (table != batch_table or len(batch) >= IMPORT_BATCH_SIZE):
+                await run_db(flush, batch_table, batch)
+                imported[batch_table] += len(batch)
+                batch = []
+            batch_table = table
+            batch.append(row)
+        if batch:
+            await run_db(flush, batch_table, batch)
+            imported[batch_table] += len(batch)
+    except DumpFormatError as e:
+        raise HTTPException(400, {"error": str(e), "imported": imported})
+    except IntegrityError as e:
+        raise HTTPException(400, {"error": str(e.orig), "imported": imported})
+    finally:
+        await run_db(finish)
+    return {"imported": imported}
 
 
 # ---------------- SEARCH ----------------
 
 @app.get("/search", response_model=SearchResults)
-def search(q: str, db: Session = Depends(get_db)):
+async def search(
+    request: Request,
+    response: Response,
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+):
+    q = q.strip()
     if not q:
         return {"skills": [], "projects": []}
 
-    skills = db.query(Skill).filter(
-        Skill.name.ilike(f"%{q}%")
-    ).all()
-    projects = db.query(Project).filter(
-        (Project.title.ilike(f"%{q}%")) |
-        (Project.description.ilike(f"%{q}%"))
-    ).all()
-    return {"skills": skills, "projects": projects}
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+
+    def load(db: Session):
+        etag = table_etag(db, ("skills", "projects"), "search", q, limit, offset)
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+        return SearchResults(
+            skills=search_skills(db, q, limit, offset),
+            projects=search_projects(db, q, limit, offset),
+        )
+
+    # results aren't cached, so only a 304 can be answered from memory
+    hit = from_memory(request, response, None, ("skills", "projects"), "search", q, limit, offset)
+    return hit or await run_db(load, read_only=True)
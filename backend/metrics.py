@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Prometheus text exposition without the client library: counters and
+# histograms are plain dicts behind one lock, updated once per request and
+# once per SQL statement.
+
+LATENCY_BUCKETS = tuple(
+    float(b) for b in os.getenv(
+        "METRICS_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+    ).split(",")
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    """DB work done on behalf of one request (shared with threadpool copies of the context)."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+# (metric, key in the /stats/* dict, type, help)
+CACHE_METRICS = [
+    ("cache_hits_total", "hits", "counter", "Response cache hits."),
+    ("cache_misses_total", "misses", "counter", "Response cache misses."),
+    ("cache_evictions_total", "evictions", "counter", "Entries dropped by the LRU bound."),
+    ("cache_invalidations_total", "invalidations", "counter", "Entries dropped by writes."),
+    ("cache_size", "size", "gauge", "Entries currently cached."),
+]
+POOL_METRICS = [
+    ("db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out."),
+    ("db_pool_overflow", "overflow", "gauge", "Overflow connections currently open."),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Connection checkouts."),
+    ("db_pool_timeouts_total", "timeouts", "counter", "Checkouts that gave up waiting for a connection."),
+    ("db_pool_wait_seconds_total", "wait_seconds_total", "counter", "Time spent waiting for a connection."),
+]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.request_queries: dict[tuple[str, str], int] = {}
+        self.request_db_seconds: dict[tuple[str, str], float] = {}
+        self.queries = 0
+        self.query_latency = Histogram()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        with self._lock:
+            status_key = (method, route, str(status))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = Histogram()
+            hist.observe(seconds)
+            self.request_queries[key] = self.request_queries.get(key, 0) + stats.queries
+            self.request_db_seconds[key] = self.request_db_seconds.get(key, 0.0) + stats.db_seconds
+
+    def observe_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.query_latency.observe(seconds)
+
+    def render(self, cache_stats: dict, pool_stats: dict) -> str:
+        out: list[str] = []
+        with self._lock:
+            _family(out, "http_requests_total", "counter", "Requests by route template and status.")
+            for (method, route, status), n in sorted(self.requests.items()):
+                out.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {n}")
+            _family(out, "http_request_duration_seconds", "histogram", "Request latency by route template.")
+            for (method, route), hist in sorted(self.latency.items()):
+                _histogram(out, "http_request_duration_seconds", hist, method=method, route=route)
+            _family(out, "http_request_db_queries_total", "counter", "SQL statements run by requests, by route.")
+            for (method, route), n in sorted(self.request_queries.items()):
+                out.append(f"http_request_db_queries_total{_labels(method=method, route=route)} {n}")
+            _family(out, "http_request_db_seconds_total", "counter", "Time spent in SQL statements, by route.")
+            for (method, route), s in sorted(self.request_db_seconds.items()):
+                out.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {s:.6f}")
+            _family(out, "db_query_duration_seconds", "histogram", "Duration of every SQL statement.")
+            _histogram(out, "db_query_duration_seconds", self.query_latency)
+
+        for metric, key, kind, help_text in CACHE_METRICS:
+            _family(out, metric, kind, help_text)
+            out.append(f"{metric} {cache_stats[key]}")
+        for metric, key, kind, help_text in POOL_METRICS:
+            _family(out, metric, kind, help_text)
+            for pool, snapshot in sorted(pool_stats.items()):
+                out.append(f"{metric}{_labels(pool=pool)} {snapshot[key]}")
+        out.append("")
+        return "\n".join(out)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _family(out: list[str], name: str, kind: str, help_text: str) -> None:
+    out.append(f"# HELP {name} {help_text}")
+    out.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(out: list[str], name: str, hist: Histogram, **labels: str) -> None:
+    cumulative = 0
+    for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), hist.counts):
+        cumulative += n
+        out.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    suffix = _labels(**labels) if labels else ""
+    out.append(f"{name}_sum{suffix} {hist.sum:.6f}")
+    out.append(f"{name}_count{suffix} {hist.count}")
+
+
+metrics = Metrics()
+
+
+def instrument_engine(sync_engine) -> None:
+    """Time every statement on ``sync_engine`` and charge it to the current request."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics.observe_query(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware (no BaseHTTPMiddleware task hop) recording every HTTP request.
+
+    Requests are labelled with the route template ("/skills/{skill_id}"),
+    not the raw path, so label cardinality stays fixed.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - start,
+                stats,
+            )
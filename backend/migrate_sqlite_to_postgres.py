@@ -1,9 +1,20 @@
+import argparse
+import json
 import os
-import sys
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from models import Base, Profile, Skill, Project, Work
+from sqlalchemy import create_engine, insert, inspect, select, tuple_
+
+from database import upgrade_schema
+from dataio import TABLES, copy_rows, is_empty, reset_data, reset_sequences
+from models import proficiency_score
+from versions import TRACKED_TABLES, bump_versions
+
+# Tables are copied stage by stage; tables inside a stage only depend on
+# earlier stages, so they can be loaded in parallel.
+STAGES = [["profiles"], ["skills", "projects", "work"], ["project_skills"]]
 
 
 def normalize_db_url(url: str) -> str:
@@ -18,110 +29,182 @@ def make_engine(url: str):
     return create_engine(url, connect_args=connect_args, pool_pre_ping=True)
 
 
-def print_usage() -> None:
-    print("Usage:")
-    print("  set TARGET_DATABASE_URL=<postgres_url>")
-    print("  python backend/migrate_sqlite_to_postgres.py --reset")
-    print("")
-    print("Optional:")
-    print("  set SQLITE_URL=sqlite:///./meapi.db")
-
-
-def reset_target(session) -> None:
-    session.query(Work).delete()
-    session.query(Project).delete()
-    session.query(Skill).delete()
-    session.query(Profile).delete()
-    session.commit()
-
-
-def target_is_empty(session) -> bool:
-    return (
-        session.query(Profile).count() == 0
-        and session.query(Skill).count() == 0
-        and session.query(Project).count() == 0
-        and session.query(Work).count() == 0
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Copy the SQLite database into Postgres in resumable, keyset-ordered chunks.",
+        epilog="Reads SQLITE_URL (default sqlite:///./meapi.db) and TARGET_DATABASE_URL or DATABASE_URL.",
     )
+    parser.add_argument("--reset", action="store_true", help="wipe the target before copying")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted run")
+    parser.add_argument("--chunk-size", type=int, default=int(os.getenv("MIGRATE_CHUNK_SIZE", "5000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MIGRATE_WORKERS", "3")),
+                        help="tables loaded in parallel within a stage")
+    parser.add_argument("--checkpoint", default=os.getenv("MIGRATE_CHECKPOINT", ".migrate_checkpoint.json"))
+    parser.add_argument("--no-copy", action="store_true", help="use INSERT executemany instead of COPY")
+    return parser
+
+
+class Checkpoint:
+    """Last primary key committed per table, saved after every chunk."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.last_keys: dict[str, list] = {}
+
+    def load(self) -> None:
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            # older checkpoints stored a bare id
+            self.last_keys = {k: v if isinstance(v, list) else [v] for k, v in saved.items()}
+
+    def update(self, table: str, last_key: list) -> None:
+        with self._lock:
+            self.last_keys[table] = last_key
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.last_keys, f)
+            os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def resume_point(engine_dst, table, checkpoint: Checkpoint) -> list | None:
+    # a crash can land between a chunk's commit and the checkpoint write, so
+    # the target's highest key wins over the file
+    key = list(table.primary_key.columns)
+    with engine_dst.connect() as conn:
+        committed = conn.execute(select(*key).order_by(*(c.desc() for c in key)).limit(1)).first()
+    candidates = [list(k) for k in (committed, checkpoint.last_keys.get(table.name)) if k is not None]
+    return max(candidates) if candidates else None
+
+
+def source_columns(engine_src, table) -> list | None:
+    """Columns of ``table`` present in the source, or None if the table isn't there.
+
+    The source is read as it is: a file from before the latest migrations
+    still copies, while the target is always upgraded to head.
+    """
+    insp = inspect(engine_src)
+    if not insp.has_table(table.name):
+        return None
+    present = {c["name"] for c in insp.get_columns(table.name)}
+    return [c for c in table.columns if c.name in present]
+
+
+# columns added by migrations whose value comes from the rest of the row
+DERIVED_COLUMNS = {
+    ("skills", "score"): lambda row: proficiency_score(row.get("proficiency")),
+}
+
+
+def complete_row(row, missing: list) -> dict:
+    row = dict(row)
+    for column in missing:
+        derive = DERIVED_COLUMNS.get((column.table.name, column.name))
+        if derive is not None:
+            row[column.name] = derive(row)
+        else:
+            row[column.name] = column.default.arg if column.default is not None else None
+    return row
 
 
-def copy_table(session_dst, rows, model_cls):
-    for row in rows:
-        data = row.__dict__.copy()
-        data.pop("_sa_instance_state", None)
-        session_dst.add(model_cls(**data))
-
-
-def reset_sequences(engine_dst):
-    if engine_dst.dialect.name != "postgresql":
-        return
-    with engine_dst.begin() as conn:
-        for table in ["profiles", "skills", "projects", "work"]:
-            conn.execute(
-                text(
-                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
-                    f"(SELECT COALESCE(MAX(id), 0) FROM {table}), true)"
-                )
-            )
-
-
-def main() -> int:
+def copy_table(engine_src, engine_dst, table, start_after: list | None, chunk_size: int, use_copy: bool,
+               checkpoint: Checkpoint) -> int:
+    columns = source_columns(engine_src, table)
+    if columns is None:
+        print(f"  {table.name}: not in the source, skipped", flush=True)
+        return 0
+    missing = [c for c in table.columns if c not in columns]
+    # keyset over the primary key (composite for project_skills)
+    key = list(table.primary_key.columns)
+    last_key = start_after
+    copied = 0
+    with engine_src.connect() as src:
+        while True:
+            stmt = select(*columns).order_by(*key).limit(chunk_size)
+            if last_key is not None:
+                stmt = stmt.where(tuple_(*key) > tuple_(*last_key))
+            rows = [complete_row(r, missing) for r in src.execute(stmt).mappings()]
+            if not rows:
+                return copied
+            with engine_dst.begin() as dst:
+                if use_copy:
+                    copy_rows(dst, table, rows)
+                else:
+                    dst.execute(insert(table), rows)
+            last_key = [rows[-1][c.name] for c in key]
+            copied += len(rows)
+            checkpoint.update(table.name, last_key)
+            print(f"  {table.name}: {copied} rows (last key {last_key})", flush=True)
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
     sqlite_url = os.getenv("SQLITE_URL", "sqlite:///./meapi.db")
     target_url = os.getenv("TARGET_DATABASE_URL") or os.getenv("DATABASE_URL")
 
     if not target_url:
         print("Missing TARGET_DATABASE_URL or DATABASE_URL.")
-        print_usage()
+        parser.print_help()
         return 1
 
     target_url = normalize_db_url(target_url)
     if target_url.startswith("sqlite"):
         print("TARGET_DATABASE_URL must point to Postgres, not SQLite.")
         return 1
-
-    reset_flag = "--reset" in sys.argv
+    if args.reset and args.resume:
+        print("--reset and --resume are mutually exclusive.")
+        return 1
 
     engine_src = make_engine(sqlite_url)
     engine_dst = make_engine(target_url)
+    use_copy = not args.no_copy and engine_dst.dialect.driver == "psycopg2"
 
-    Base.metadata.create_all(bind=engine_dst)
-
-    SessionSrc = sessionmaker(bind=engine_src)
-    SessionDst = sessionmaker(bind=engine_dst)
+    upgrade_schema(engine_dst)
 
-    src = SessionSrc()
-    dst = SessionDst()
+    checkpoint = Checkpoint(args.checkpoint)
+    with engine_dst.begin() as conn:
+        if args.reset:
+            reset_data(conn)
+            checkpoint.clear()
+        elif args.resume:
+            checkpoint.load()
+        elif not is_empty(conn):
+            print("Target database is not empty.")
+            print("Run with --reset to wipe target before copying, or --resume to continue.")
+            return 1
+
+    started = time.perf_counter()
+    totals: dict[str, int] = {}
+    for stage in STAGES:
+        tables = [TABLES[name] for name in stage]
+        starts = {t.name: resume_point(engine_dst, t, checkpoint) if args.resume else None for t in tables}
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {
+                t.name: pool.submit(
+                    copy_table, engine_src, engine_dst, t, starts[t.name], args.chunk_size, use_copy, checkpoint
+                )
+                for t in tables
+            }
+            for name, future in futures.items():
+                totals[name] = future.result()
 
-    try:
-        if reset_flag:
-            reset_target(dst)
-        else:
-            if not target_is_empty(dst):
-                print("Target database is not empty.")
-                print("Run with --reset to wipe target before copying.")
-                return 1
-
-        profiles = src.query(Profile).all()
-        skills = src.query(Skill).all()
-        projects = src.query(Project).all()
-        work = src.query(Work).all()
-
-        copy_table(dst, profiles, Profile)
-        copy_table(dst, skills, Skill)
-        copy_table(dst, projects, Project)
-        copy_table(dst, work, Work)
-
-        dst.commit()
-        reset_sequences(engine_dst)
-
-        print("Migration complete.")
-        print(f"Profiles: {len(profiles)}")
-        print(f"Skills: {len(skills)}")
-        print(f"Projects: {len(projects)}")
-        print(f"Work: {len(work)}")
-        return 0
-    finally:
-        src.close()
-        dst.close()
+    with engine_dst.begin() as conn:
+        reset_sequences(conn)
+        if inspect(conn).has_table("table_versions"):
+            # invalidate ETags / cached responses of any running API instance
+            bump_versions(conn, *TRACKED_TABLES)
+    checkpoint.clear()
+
+    print(f"Migration complete in {time.perf_counter() - started:.1f}s.")
+    for name in TABLES:
+        print(f"{name.capitalize()}: {totals.get(name, 0)}")
+    return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from database import DATABASE_URL, connect_args
+from models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+# upgrade_schema() passes an open connection (and keeps the app's logging);
+# the alembic CLI gets a fresh engine for DATABASE_URL
+connection = config.attributes.get("connection")
+if connection is None and config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # search objects (FTS5 tables, pg_trgm indexes) live outside the models;
+    # don't let autogenerate propose dropping them
+    return not (reflected and compare_to is None and type_ in ("table", "index"))
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(DATABASE_URL, connect_args=connect_args)
+    with engine.connect() as conn:
+        context.configure(connection=conn, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,131 @@
+"""baseline: tables, search indexes and table_versions
+
+Databases created before migrations existed (by Base.metadata.create_all)
+already have these tables, so every step only creates what is missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Search objects as of this revision. They are inlined rather than imported
+# from search.py so that later edits there can't change what the baseline does.
+# SQLite: FTS5 trigram tables kept in sync by triggers.
+# Postgres: pg_trgm GIN indexes.
+SQLITE_FTS = {
+    "skills_fts": ("skills", ["name"]),
+    "projects_fts": ("projects", ["title", "description"]),
+}
+POSTGRES_TRGM_INDEXES = {
+    "ix_skills_name_trgm": ("skills", "name"),
+    "ix_projects_title_trgm": ("projects", "title"),
+    "ix_projects_description_trgm": ("projects", "description"),
+}
+TABLES = ["profiles", "skills", "projects", "work", "table_versions"]
+
+
+def _sqlite_fts_ddl(fts: str, table: str, cols: list[str]) -> list[str]:
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    delete_row = f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});"
+    insert_row = f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN {delete_row} {insert_row} END",
+    ]
+
+
+def _create_search(bind, existing: set[str]) -> None:
+    if bind.dialect.name == "sqlite":
+        for fts, (table, cols) in SQLITE_FTS.items():
+            for stmt in _sqlite_fts_ddl(fts, table, cols):
+                op.execute(stmt)
+            if fts not in existing:
+                # adopted database: index the rows already there
+                op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    elif bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for index, (table, column) in POSTGRES_TRGM_INDEXES.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "profiles" not in existing:
+        op.create_table(
+            "profiles",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False, unique=True),
+            sa.Column("education", sa.String(), nullable=False),
+            sa.Column("github", sa.String(), nullable=True),
+            sa.Column("linkedin", sa.String(), nullable=True),
+        )
+        op.create_index("ix_profiles_id", "profiles", ["id"])
+    if "skills" not in existing:
+        op.create_table(
+            "skills",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("proficiency", sa.String(), nullable=False),
+            sa.Column("profile_id", sa.Integer(), sa.ForeignKey("profiles.id"), nullable=False),
+        )
+        op.create_index("ix_skills_id", "skills", ["id"])
+    if "projects" not in existing:
+        op.create_table(
+            "projects",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=False),
+            sa.Column("links", sa.JSON(), nullable=True),
+            sa.Column("profile_id", sa.Integer(), sa.ForeignKey("profiles.id"), nullable=False),
+        )
+        op.create_index("ix_projects_id", "projects", ["id"])
+    if "work" not in existing:
+        op.create_table(
+            "work",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("company", sa.String(), nullable=False),
+            sa.Column("role", sa.String(), nullable=False),
+            sa.Column("start_date", sa.String(), nullable=False),
+            sa.Column("end_date", sa.String(), nullable=True),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("profile_id", sa.Integer(), sa.ForeignKey("profiles.id"), nullable=False),
+        )
+        op.create_index("ix_work_id", "work", ["id"])
+    if "table_versions" not in existing:
+        op.create_table(
+            "table_versions",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+        )
+
+    _create_search(bind, existing)
+
+
+def downgrade() -> None:
+    # drops everything, data included; pg_trgm stays since other schemas may use it
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for fts in SQLITE_FTS:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+    elif bind.dialect.name == "postgresql":
+        for index in POSTGRES_TRGM_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+    for table in reversed(TABLES):
+        op.drop_table(table)
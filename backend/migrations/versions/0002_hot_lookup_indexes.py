@@ -0,0 +1,39 @@
+"""indexes on foreign keys and skills.name, unique (profile_id, name) on skills
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_skills_name", "skills", ["name"], False),
+    ("ix_projects_profile_id", "projects", ["profile_id"], False),
+    ("ix_work_profile_id", "work", ["profile_id"], False),
+    ("uq_skills_profile_name", "skills", ["profile_id", "name"], True),
+]
+
+
+def upgrade() -> None:
+    # POST /skills never rejected duplicates; keep the oldest row of each
+    # (profile_id, name) so the unique index can be built
+    op.execute(
+        "DELETE FROM skills WHERE id NOT IN "
+        "(SELECT MIN(id) FROM skills GROUP BY profile_id, name)"
+    )
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, unique in INDEXES:
+        existing = {ix["name"] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""project_skills: many-to-many tags between projects and skills
+
+Existing projects are tagged with the skills of their profile whose name
+appears in the project's title or description.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_skills",
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("skill_id", sa.Integer(), sa.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_project_skills_skill_id_project_id", "project_skills", ["skill_id", "project_id"])
+    op.execute(
+        "INSERT INTO project_skills (project_id, skill_id) "
+        "SELECT p.id, s.id FROM projects p JOIN skills s ON s.profile_id = p.profile_id "
+        "WHERE lower(p.title) LIKE '%' || lower(s.name) || '%' "
+        "OR lower(p.description) LIKE '%' || lower(s.name) || '%'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_project_skills_skill_id_project_id", table_name="project_skills")
+    op.drop_table("project_skills")
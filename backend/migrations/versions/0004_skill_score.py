@@ -0,0 +1,34 @@
+"""skills.score: ordinal of proficiency, indexed for /skills/top
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# snapshot of models.PROFICIENCY_SCORES at this revision
+SCORES = {
+    "beginner": 1, "basic": 1, "novice": 1,
+    "medium": 2, "intermediate": 2, "familiar": 2,
+    "advanced": 3, "proficient": 3,
+    "expert": 4, "master": 4,
+}
+
+
+def upgrade() -> None:
+    # plain ALTER TABLE: batch mode would rebuild skills and drop its FTS triggers
+    op.add_column("skills", sa.Column("score", sa.Integer(), nullable=False, server_default="0"))
+    cases = " ".join(f"WHEN '{name}' THEN {score}" for name, score in SCORES.items())
+    op.execute(f"UPDATE skills SET score = CASE lower(trim(proficiency)) {cases} ELSE 0 END")
+    op.create_index("ix_skills_profile_id_score", "skills", ["profile_id", "score", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_skills_profile_id_score", table_name="skills")
+    op.drop_column("skills", "score")
@@ -1,7 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, JSON, Index, Table
+from sqlalchemy.orm import relationship, validates
 from database import Base
 
+# which skills each project actually uses; (skill_id, project_id) index makes
+# "projects using X" an index range scan
+project_skills = Table(
+    "project_skills",
+    Base.metadata,
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+    Column("skill_id", Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_project_skills_skill_id_project_id", "skill_id", "project_id"),
+)
+
+
 class Profile(Base):
     __tablename__ = "profiles"
 
@@ -29,16 +40,44 @@ class Profile(Base):
     )
 
 
+# proficiency is free text; score is its ordinal, kept in sync on every write
+# so /skills/top can rank from an index
+PROFICIENCY_SCORES = {
+    "beginner": 1, "basic": 1, "novice": 1,
+    "medium": 2, "intermediate": 2, "familiar": 2,
+    "advanced": 3, "proficient": 3,
+    "expert": 4, "master": 4,
+}
+
+
+def proficiency_score(proficiency: str | None) -> int:
+    return PROFICIENCY_SCORES.get((proficiency or "").strip().lower(), 0)
+
+
 class Skill(Base):
     __tablename__ = "skills"
+    __table_args__ = (
+        # also serves profile_id lookups (leftmost column)
+        Index("uq_skills_profile_name", "profile_id", "name", unique=True),
+        # /skills/top walks this backwards (ORDER BY score DESC, id DESC, no sort);
+        # not covering: name/proficiency come from the table for the `limit` rows
+        Index("ix_skills_profile_id_score", "profile_id", "score", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
 
     #  stores proficiency etc.
     proficiency = Column(String, nullable=False) 
+    score = Column(Integer, nullable=False, default=0, server_default="0")
     profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
     profile = relationship("Profile", back_populates="skills")
+    projects = relationship("Project", secondary=project_skills, back_populates="skills")
+
+    @validates("proficiency")
+    def _set_score(self, key, value):
+        self.score = proficiency_score(value)
+        return value
 
 
 class Project(Base):
@@ -51,8 +90,12 @@ class Project(Base):
     #  supports { link: "https://..." }
     links = Column(JSON, nullable=True)
 
-    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False, index=True)
     profile = relationship("Profile", back_populates="projects")
+    # selectin: list endpoints load every page's tags in one extra query
+    skills = relationship(
+        "Skill", secondary=project_skills, back_populates="projects", lazy="selectin", order_by="Skill.name"
+    )
 
 
 class Work(Base):
@@ -65,5 +108,13 @@ class Work(Base):
     end_date = Column(String, nullable=True)
     description = Column(String, nullable=True)
 
-    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False, index=True)
     profile = relationship("Profile", back_populates="work")
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # one row per API table, bumped by every write to it (drives ETags)
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
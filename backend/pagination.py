@@ -0,0 +1,39 @@
+import base64
+import binascii
+
+from fastapi import HTTPException, Response
+
+# Cursors are opaque to clients; today they just wrap the last id seen,
+# which lets list endpoints page with "WHERE id > :after" instead of OFFSET.
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, page, limit: int) -> None:
+    """Advertise the next page in ``X-Next-Cursor`` when this page is full.
+
+    ``page`` has ``count`` and ``last_id`` (see serialization.Page).
+    """
+    if page.count == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(page.last_id)
+
+
+def paginate(query, id_column, limit: int, offset: int, after: int | None):
+    """Order by id and apply a keyset (``after``) or legacy offset page (ORM Query or Core select)."""
+    query = query.order_by(id_column)
+    if after is not None:
+        return query.filter(id_column > after).limit(limit)
+    return query.offset(offset).limit(limit)
@@ -0,0 +1,179 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Opt-in profiling of a single request: an admin sends `X-Profile: 1` and the
+# DB/handler work of that request (everything passed to run_db) runs under
+# cProfile. The report is kept in a small in-memory ring and its id comes
+# back in the X-Profile-Id header.
+
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))  # reports kept per process
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "40"))  # functions listed per report
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # 0 disables
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))  # 0 disables
+SLOW_PARAMS_MAX = 500  # characters of bound parameters logged
+
+log = logging.getLogger("meapi.slow")
+
+
+class RequestProfile:
+    """cProfile runs collected for one request (one per run_db call/thread)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = []
+
+    def call(self, fn, *args):
+        import cProfile  # only profiled requests need it
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return fn(*args)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self.runs.append(profiler)
+
+    def report(self, top: int) -> str:
+        with self._lock:
+            runs = list(self.runs)
+        if not runs:
+            return "no run_db work was profiled\n"
+        import io
+        import pstats
+
+        out = io.StringIO()
+        stats = pstats.Stats(runs[0], stream=out)
+        for run in runs[1:]:
+            stats.add(run)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
+
+
+_active: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+
+def profiled(fn):
+    """Wrap ``fn`` in the current request's profiler, if the request is being profiled."""
+    profile = _active.get()
+    if profile is None:
+        return fn
+    return lambda *args: profile.call(fn, *args)
+
+
+class ProfileStore:
+    def __init__(self, keep: int):
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._reports: OrderedDict[int, dict] = OrderedDict()
+
+    def new_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile_id: int, report: dict) -> None:
+        with self._lock:
+            self._reports[profile_id] = report
+            while len(self._reports) > self.keep:
+                self._reports.popitem(last=False)
+
+    def get(self, profile_id: int) -> dict | None:
+        with self._lock:
+            return self._reports.get(profile_id)
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [
+                {k: v for k, v in r.items() if k != "stats"} for r in reversed(self._reports.values())
+            ]
+
+
+profile_store = ProfileStore(PROFILE_KEEP)
+
+
+class ProfilingMiddleware:
+    """Profiles requests carrying `X-Profile: 1` from an admin; logs slow requests.
+
+    ``is_admin(api_key)`` decides whether the X-API-Key header may profile.
+    """
+
+    def __init__(self, app, is_admin):
+        self.app = app
+        self.is_admin = is_admin
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        profile = None
+        if headers.get(b"x-profile", b"").lower() in (b"1", b"true", b"yes"):
+            api_key = headers.get(b"x-api-key", b"").decode("latin-1")
+            if self.is_admin(api_key):
+                profile = RequestProfile()
+        token = _active.set(profile) if profile is not None else None
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profile is not None:
+                    # the handler's run_db work is done by the time headers go out
+                    profile_id = profile_store.new_id()
+                    profile_store.add(profile_id, {
+                        "id": profile_id,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "query": scope.get("query_string", b"").decode("latin-1"),
+                        "status": status,
+                        "ms": round((time.perf_counter() - start) * 1000, 3),
+                        "created": time.time(),
+                        "stats": profile.report(PROFILE_TOP),
+                    })
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"x-profile-id", str(profile_id).encode())],
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                _active.reset(token)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if SLOW_REQUEST_MS > 0 and elapsed_ms >= SLOW_REQUEST_MS:
+                log.warning("slow request %.1fms %s %s -> %s", elapsed_ms, scope["method"], scope["path"], status)
+
+
+def log_slow_queries(sync_engine) -> None:
+    """Log SQL, parameters and duration of statements slower than SLOW_QUERY_MS."""
+    if SLOW_QUERY_MS <= 0:
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_start", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= SLOW_QUERY_MS:
+            params = repr(parameters)
+            if len(params) > SLOW_PARAMS_MAX:
+                params = params[:SLOW_PARAMS_MAX] + "..."
+            log.warning("slow query %.1fms%s: %s | params=%s",
+                        elapsed_ms, " (executemany)" if executemany else "", " ".join(statement.split()), params)
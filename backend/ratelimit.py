@@ -0,0 +1,172 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+# Token bucket: each client gets `limit` tokens that refill continuously at
+# limit/window per second, so there is no window edge to burst across.
+# State is (tokens, updated_at) per key; a key idle for a full window is back
+# to a full bucket and can be dropped, which is what keeps memory bounded.
+
+
+def refill(tokens: float, updated: float, now: float, limit: int, window: float) -> float:
+    rate = limit / window
+    return min(float(limit), tokens + max(0.0, now - updated) * rate)
+
+
+def take(tokens: float, limit: int, window: float) -> tuple[float, float]:
+    """Spend one token. Returns (tokens_left, retry_after); retry_after > 0 means denied."""
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) * window / limit
+
+
+class MemoryBackend:
+    """Per-process buckets with LRU bound and periodic expiry sweeps."""
+
+    def __init__(self, limit: int, window: float, max_keys: int = 10000, clock: Callable[[], float] = time.time):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    async def hit(self, key: str) -> float:
+        now = self.clock()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tokens, updated = self._buckets.pop(key, (float(self.limit), now))
+            tokens, retry_after = take(refill(tokens, updated, now, self.limit, self.window), self.limit, self.window)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    def _sweep(self, now: float) -> None:
+        # oldest entries are first; stop at the first one still refilling
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.window:
+                break
+            del self._buckets[key]
+        self._next_sweep = now + self.window
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBackend:
+    """Buckets in a SQLite file shared by every worker on the host."""
+
+    def __init__(self, limit: int, window: float, path: str, clock: Callable[[], float] = time.time):
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._next_sweep = 0.0
+
+    async def hit(self, key: str) -> float:
+        # the write lock can be held by another worker for up to the busy
+        # timeout, so the SQL runs in the threadpool, not on the event loop
+        return await run_in_threadpool(self._hit, key)
+
+    def _hit(self, key: str) -> float:
+        now = self.clock()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                row = cur.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (float(self.limit), now)
+                tokens, retry_after = take(
+                    refill(tokens, updated, now, self.limit, self.window), self.limit, self.window
+                )
+                cur.execute(
+                    "INSERT INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (key, tokens, now),
+                )
+                if now >= self._next_sweep:
+                    cur.execute("DELETE FROM rate_buckets WHERE updated < ?", (now - self.window,))
+                    self._next_sweep = now + self.window
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            return retry_after
+
+
+# KEYS[1] = bucket key; ARGV = limit, window, now
+_REDIS_TOKEN_BUCKET = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or limit
+local updated = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + math.max(0, now - updated) * limit / window)
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  retry_after = (1 - tokens) * window / limit
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisBackend:
+    """Buckets in Redis (or anything speaking its protocol), shared by all workers.
+
+    ``client`` can be any ``redis.asyncio.Redis``-compatible object, so a
+    local stand-in can be passed in place of a real server.
+    """
+
+    def __init__(self, limit: int, window: float, url: str | None = None, client=None, prefix: str = "rl:",
+                 clock: Callable[[], float] = time.time):
+        self.limit = limit
+        self.window = window
+        self.prefix = prefix
+        self.clock = clock
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+            client = redis.from_url(url or "redis://localhost:6379/0")
+        self._client = client
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def hit(self, key: str) -> float:
+        # keys expire a window after their last hit, so Redis memory stays bounded
+        result = await self._script(keys=[self.prefix + key], args=[self.limit, self.window, self.clock()])
+        return float(result)
+
+
+def build_backend(limit: int, window: float):
+    kind = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(limit, window, os.getenv("RATE_LIMIT_SQLITE_PATH", "./ratelimit.db"))
+    if kind == "redis":
+        return RedisBackend(limit, window, os.getenv("RATE_LIMIT_REDIS_URL"))
+    if kind != "memory":
+        raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {kind}")
+    return MemoryBackend(limit, window, int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000")))
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict, Any
 
 # -------- PROFILE --------
@@ -56,6 +56,7 @@ class SkillOut(BaseModel):
     id: int
     name: str
     proficiency: str
+    score: int = 0
 
     class Config:
         from_attributes = True
@@ -66,21 +67,33 @@ class ProjectCreate(BaseModel):
     title: str
     description: str
     links: Optional[Dict[str, Any]] = None   #  { "link": "url" }
+    skills: Optional[List[str]] = None  # names of the profile's skills used
 
 
 class ProjectUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     links: Optional[Dict[str, Any]] = None
+    skills: Optional[List[str]] = None
 
 
 class ProjectOut(ProjectCreate):
     id: int
+    skills: List[str] = []
+
+    @field_validator("skills", mode="before")
+    @classmethod
+    def skill_names(cls, v):
+        return [getattr(s, "name", s) for s in v or []]
 
     class Config:
         from_attributes = True
 
 
+class ProfileSummaryOut(ProfileCreate):
+    id: int
+
+
 class ProfileOut(ProfileCreate):
     id: int
     skills: List[SkillOut] = []
@@ -91,6 +104,28 @@ class ProfileOut(ProfileCreate):
         from_attributes = True
 
 
+class BundleOut(BaseModel):
+    # only the requested sections are present; profile is null if none exists yet
+    profile: Optional[ProfileSummaryOut] = None
+    skills: Optional[List[SkillOut]] = None
+    projects: Optional[List[ProjectOut]] = None
+    work: Optional[List[WorkOut]] = None
+
+
 class SearchResults(BaseModel):
     skills: List[SkillOut] = []
     projects: List[ProjectOut] = []
+
+
+# -------- BATCH --------
+class BatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models import Skill, Project
+
+# SQLite: FTS5 tables (trigram tokenizer = case-insensitive substring match)
+# kept in sync with the base tables by triggers.
+# Postgres: pg_trgm GIN indexes so ILIKE '%q%' is answered from the index.
+
+SQLITE_FTS = {
+    "skills_fts": ("skills", ["name"]),
+    "projects_fts": ("projects", ["title", "description"]),
+}
+
+# trigram tokens are 3 chars; shorter queries can't hit the FTS index
+MIN_FTS_QUERY = 3
+
+
+def _sqlite_fts_ddl(fts: str, table: str, cols: list[str]) -> list[str]:
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    delete_row = (
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});"
+    )
+    insert_row = f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN {delete_row} {insert_row} END",
+    ]
+
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_skills_name_trgm ON skills USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_projects_title_trgm ON projects USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_projects_description_trgm ON projects USING gin (description gin_trgm_ops)",
+]
+
+
+def setup_search(conn) -> None:
+    """Create search indexes for the connected dialect (idempotent)."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        existing = {
+            r[0] for r in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))
+        }
+        for fts, (table, cols) in SQLITE_FTS.items():
+            for stmt in _sqlite_fts_ddl(fts, table, cols):
+                conn.execute(text(stmt))
+            if fts not in existing:
+                # first run on an existing database: index the rows already there
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for stmt in POSTGRES_DDL:
+            conn.execute(text(stmt))
+
+
+@contextmanager
+def fts_bulk_load(conn):
+    """Index rows inserted inside the block with one INSERT ... SELECT per FTS table (SQLite).
+
+    The per-row insert triggers are dropped for the duration, so only use it
+    for append-only loads (rows get ids above the current maximum).
+    """
+    if conn.dialect.name != "sqlite":
+        yield
+        return
+    before = {}
+    for fts, (table, _) in SQLITE_FTS.items():
+        before[fts] = conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar()
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {fts}_ai"))
+    yield
+    for fts, (table, cols) in SQLITE_FTS.items():
+        col_list = ", ".join(cols)
+        conn.execute(
+            text(f"INSERT INTO {fts}(rowid, {col_list}) SELECT id, {col_list} FROM {table} WHERE id > :after"),
+            {"after": before[fts]},
+        )
+    setup_search(conn)  # puts the triggers back
+
+
+def like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(q: str) -> str:
+    return '"' + q.replace('"', '""') + '"'
+
+
+def search_skills(db: Session, q: str, limit: int, offset: int) -> list[Skill]:
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and len(q) >= MIN_FTS_QUERY:
+        stmt = text(
+            "SELECT skills.* FROM skills_fts JOIN skills ON skills.id = skills_fts.rowid "
+            "WHERE skills_fts MATCH :match "
+            "ORDER BY bm25(skills_fts), skills.id LIMIT :limit OFFSET :offset"
+        )
+        params = {"match": _fts_phrase(q)}
+    elif dialect == "postgresql":
+        stmt = text(
+            "SELECT * FROM skills WHERE name ILIKE :like "
+            "ORDER BY similarity(name, :q) DESC, id LIMIT :limit OFFSET :offset"
+        )
+        params = {"like": like_pattern(q), "q": q}
+    else:
+        return (
+            db.query(Skill)
+            .filter(Skill.name.ilike(like_pattern(q), escape="\\"))
+            .order_by(Skill.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+    params.update(limit=limit, offset=offset)
+    return db.query(Skill).from_statement(stmt).params(**params).all()
+
+
+def search_projects(db: Session, q: str, limit: int, offset: int) -> list[Project]:
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and len(q) >= MIN_FTS_QUERY:
+        stmt = text(
+            "SELECT projects.* FROM projects_fts JOIN projects ON projects.id = projects_fts.rowid "
+            "WHERE projects_fts MATCH :match "
+            # title hits weigh more than description hits
+            "ORDER BY bm25(projects_fts, 10.0, 1.0), projects.id LIMIT :limit OFFSET :offset"
+        )
+        params = {"match": _fts_phrase(q)}
+    elif dialect == "postgresql":
+        stmt = text(
+            "SELECT * FROM projects WHERE title ILIKE :like OR description ILIKE :like "
+            "ORDER BY greatest(similarity(title, :q), word_similarity(:q, description) / 2) DESC, id "
+            "LIMIT :limit OFFSET :offset"
+        )
+        params = {"like": like_pattern(q), "q": q}
+    else:
+        like = like_pattern(q)
+        return (
+            db.query(Project)
+            .filter(
+                (Project.title.ilike(like, escape="\\")) |
+                (Project.description.ilike(like, escape="\\"))
+            )
+            .order_by(Project.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+    params.update(limit=limit, offset=offset)
+    return db.query(Project).from_statement(stmt).params(**params).all()
@@ -1,75 +1,273 @@
-from database import SessionLocal
-from models import Profile, Skill, Project, Work
+import argparse
+import random
+import time
+from contextlib import contextmanager
 
-db = SessionLocal()
+from sqlalchemy import func, insert, select
 
-# ================= PROFILE =================
-profile = db.query(Profile).first()
+from database import engine, upgrade_schema
+from dataio import copy_rows, reset_sequences
+from models import Profile, Skill, Project, Work, project_skills, proficiency_score
+from search import fts_bulk_load
+from versions import TRACKED_TABLES, bump_versions, ensure_versions
 
-if not profile:
-    profile = Profile(
-        name="K V Dheeraj Reddy",
-        email="dheerajsmile236@gmail.com",
-        education="B.Tech in Engineering Physics at IIT Mandi",
-        github="https://github.com/Dracula-5",
-        linkedin="https://www.linkedin.com/in/k-v-dheeraj-reddy-727075303/",
+# Bulk seeder. Rows are streamed from generators with explicit ids (so tags
+# can reference projects without reading them back) and written in batches
+# inside one transaction: executemany on SQLite, COPY on Postgres (psycopg2).
+
+# synthetic presets: total skills + projects + work rows
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SEED_BATCH_SIZE = 20_000
+
+WORDS = [
+    "Python", "FastAPI", "SQL", "Docker", "Postgres", "React", "Redis", "Kafka",
+    "Go", "Rust", "Kubernetes", "GraphQL", "Terraform", "Linux", "Pandas", "LLM",
+]
+PROFICIENCIES = ["Beginner", "Medium", "Advanced", "Expert"]
+ROLES = ["Software Engineer", "Backend Engineer", "Intern", "Tech Lead", "Data Engineer"]
+
+DEMO_PROFILE = {
+    "name": "K V Dheeraj Reddy",
+    "email": "dheerajsmile236@gmail.com",
+    "education": "B.Tech in Engineering Physics at IIT Mandi",
+    "github": "https://github.com/Dracula-5",
+    "linkedin": "https://www.linkedin.com/in/k-v-dheeraj-reddy-727075303/",
+}
+DEMO_SKILLS = [("Python", "Advanced"), ("FastAPI", "Medium"), ("SQL", "Medium"), ("Docker", "Beginner"), ("LLM", "Beginner")]
+
+
+def _next_id(conn, table) -> int:
+    return conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() + 1
+
+
+def _flush(conn, table, batch: list[dict]) -> None:
+    if conn.dialect.driver == "psycopg2":
+        copy_rows(conn, table, batch)
+    else:
+        conn.execute(insert(table), batch)
+
+
+def _write(conn, table, rows, batch_size: int) -> int:
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            _flush(conn, table, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        _flush(conn, table, batch)
+        written += len(batch)
+    return written
+
+
+def seed_demo() -> None:
+    """The sample profile, its five skills, one project and one work entry (single transaction)."""
+    with engine.begin() as conn:
+        profile_id = conn.execute(select(Profile.id).order_by(Profile.id).limit(1)).scalar()
+        if profile_id is None:
+            profile_id = conn.execute(insert(Profile).returning(Profile.id), DEMO_PROFILE).scalar()
+
+        have = set(conn.execute(select(Skill.name).where(Skill.profile_id == profile_id)).scalars())
+        skills = [
+            {"name": name, "proficiency": p, "score": proficiency_score(p), "profile_id": profile_id}
+            for name, p in DEMO_SKILLS if name not in have
+        ]
+        if skills:
+            conn.execute(insert(Skill), skills)
+        conn.execute(insert(Project), {
+            "title": "Sample Project",
+            "description": "This is a sample project description",
+            "links": {"link": "https://example.com"},
+            "profile_id": profile_id,
+        })
+        conn.execute(insert(Work), {
+            "company": "Example Company",
+            "role": "Software Engineer",
+            "start_date": "2023-01",
+            "end_date": None,
+            "description": "Built APIs and internal tooling.",
+            "profile_id": profile_id,
+        })
+        bump_versions(conn, *TRACKED_TABLES)
+
+
+class Synthetic:
+    """Row generators for ``profiles`` new profiles with ``skills``/``projects``/``work`` rows each.
+
+    Ids are assigned from ``first_ids`` in order, so profile ``p`` owns skill
+    ids ``first_ids["skills"] + p * skills`` onward and rows can be streamed
+    table by table. Each table has its own RNG, derived from ``rng_seed``.
+    """
+
+    def __init__(self, rng_seed: int, first_ids: dict[str, int], profiles: int, skills: int,
+                 projects: int, work: int, tags: int):
+        self.rng_seed = rng_seed
+        self.first = first_ids
+        self.profiles, self.skills, self.projects, self.work = profiles, skills, projects, work
+        self.tags = min(tags, skills)
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.rng_seed}:{table}")
+
+    def profile_rows(self):
+        rng = self._rng("profiles")
+        for p in range(self.profiles):
+            pid = self.first["profiles"] + p
+            yield {
+                "id": pid,
+                "name": f"User {pid}",
+                "email": f"user{pid}@example.com",
+                "education": f"B.Tech, batch of {rng.randint(2000, 2025)}",
+                "github": f"https://github.com/user{pid}",
+                "linkedin": None,
+            }
+
+    def skill_rows(self):
+        rng = self._rng("skills")
+        sid = self.first["skills"]
+        for p in range(self.profiles):
+            for i in range(self.skills):
+                proficiency = rng.choice(PROFICIENCIES)
+                yield {
+                    "id": sid,
+                    # unique per profile: Python, ..., LLM, Python 1, ...
+                    "name": WORDS[i % len(WORDS)] + (f" {i // len(WORDS)}" if i >= len(WORDS) else ""),
+                    "proficiency": proficiency,
+                    "score": proficiency_score(proficiency),
+                    "profile_id": self.first["profiles"] + p,
+                }
+                sid += 1
+
+    def project_rows(self):
+        rng = self._rng("projects")
+        project_id = self.first["projects"]
+        for p in range(self.profiles):
+            for _ in range(self.projects):
+                a, b = rng.choice(WORDS), rng.choice(WORDS)
+                yield {
+                    "id": project_id,
+                    "title": f"{a} {rng.choice(['service', 'dashboard', 'pipeline', 'bot', 'toolkit'])} {project_id}",
+                    "description": f"Built with {a} and {b}.",
+                    "links": {"link": f"https://example.com/projects/{project_id}"},
+                    "profile_id": self.first["profiles"] + p,
+                }
+                project_id += 1
+
+    def work_rows(self):
+        rng = self._rng("work")
+        work_id = self.first["work"]
+        for p in range(self.profiles):
+            for _ in range(self.work):
+                start = rng.randint(2010, 2024)
+                yield {
+                    "id": work_id,
+                    "company": f"Company {rng.randint(1, 5000)}",
+                    "role": rng.choice(ROLES),
+                    "start_date": f"{start}-{rng.randint(1, 12):02d}",
+                    "end_date": None if rng.randint(0, 3) == 0 else f"{start + rng.randint(0, 2)}-{rng.randint(1, 12):02d}",
+                    "description": f"Worked on {rng.choice(WORDS)} and {rng.choice(WORDS)}.",
+                    "profile_id": self.first["profiles"] + p,
+                }
+                work_id += 1
+
+    def tag_rows(self):
+        rng = self._rng("project_skills")
+        project_id = self.first["projects"]
+        for p in range(self.profiles):
+            own_first = self.first["skills"] + p * self.skills
+            for _ in range(self.projects):
+                for offset in rng.sample(range(self.skills), self.tags):
+                    yield {"project_id": project_id, "skill_id": own_first + offset}
+                project_id += 1
+
+
+@contextmanager
+def sqlite_bulk_pragmas(conn):
+    """No fsync per commit and a bigger page cache while loading (SQLite).
+
+    The connection comes from the app's pool (a single writer under the tuned
+    profile), so its own settings are put back before it is released.
+    """
+    if conn.dialect.name != "sqlite":
+        yield
+        return
+    restore = {}
+    for pragma, value in (("synchronous", "OFF"), ("cache_size", "-200000")):
+        restore[pragma] = conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+        conn.exec_driver_sql(f"PRAGMA {pragma}={value}")
+    conn.commit()
+    try:
+        yield
+    finally:
+        for pragma, value in restore.items():
+            conn.exec_driver_sql(f"PRAGMA {pragma}={value}")
+        conn.commit()
+
+
+def seed_synthetic(profiles: int, skills: int, projects: int, work: int, tags: int = 3,
+                   rng_seed: int = 42, batch_size: int = SEED_BATCH_SIZE) -> dict[str, int]:
+    """Add synthetic profiles in one transaction; the same seed gives the same rows."""
+    counts = {}
+    with engine.connect() as conn, sqlite_bulk_pragmas(conn):
+        with conn.begin():
+            first_ids = {m.__tablename__: _next_id(conn, m.__table__) for m in (Profile, Skill, Project, Work)}
+            data = Synthetic(rng_seed, first_ids, profiles, skills, projects, work, tags)
+            with fts_bulk_load(conn):
+                for table, rows in (
+                    (Profile.__table__, data.profile_rows()),
+                    (Skill.__table__, data.skill_rows()),
+                    (Project.__table__, data.project_rows()),
+                    (Work.__table__, data.work_rows()),
+                    (project_skills, data.tag_rows()),
+                ):
+                    counts[table.name] = _write(conn, table, rows, batch_size)
+            reset_sequences(conn)
+            bump_versions(conn, *TRACKED_TABLES)
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Seed the database: demo rows by default, or synthetic profiles for load tests.",
+        epilog="Examples: seed.py --scale 1m | seed.py --profiles 10 --skills 50 --projects 20000 --work 20000",
     )
-    db.add(profile)
-    db.commit()
-    db.refresh(profile)
-
-# ================= SKILLS =================
-def get_or_create_skill(name, proficiency):
-    skill = db.query(Skill).filter(
-        Skill.name == name,
-        Skill.profile_id == profile.id
-    ).first()
-
-    if not skill:
-        skill = Skill(
-            name=name,
-            proficiency=proficiency,
-            profile_id=profile.id
-        )
-        db.add(skill)
-        db.commit()
-        db.refresh(skill)
-
-    return skill
-
-
-python = get_or_create_skill("Python", "Advanced")
-fastapi = get_or_create_skill("FastAPI", "Medium")
-sql = get_or_create_skill("SQL", "Medium")
-docker = get_or_create_skill("Docker", "Beginner")
-llm = get_or_create_skill("LLM", "Beginner")
-
-
-# ================= PROJECTS =================
-title = "Sample Project"
-description = "This is a sample project description"
-link = "https://example.com"
-
-project = Project(
-    title=title,
-    description=description,
-    links={"link": link},
-    profile_id=profile.id
-)
-db.add(project)
-db.commit()
-
-# ================= WORK =================
-work = Work(
-    company="Example Company",
-    role="Software Engineer",
-    start_date="2023-01",
-    end_date=None,
-    description="Built APIs and internal tooling.",
-    profile_id=profile.id
-)
-db.add(work)
-db.commit()
-
-db.close()
-print(" Database seeded successfully")
+    parser.add_argument("--scale", choices=sorted(SCALES), help="preset: 1 profile, this many rows in total")
+    parser.add_argument("--profiles", type=int, help="number of synthetic profiles to add")
+    parser.add_argument("--skills", type=int, default=50, help="skills per profile (default 50)")
+    parser.add_argument("--projects", type=int, default=100, help="projects per profile (default 100)")
+    parser.add_argument("--work", type=int, default=100, help="work entries per profile (default 100)")
+    parser.add_argument("--tags", type=int, default=3, help="skills tagged on each project (default 3)")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed; same seed, same data")
+    parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    upgrade_schema()
+    with engine.begin() as conn:
+        ensure_versions(conn)
+
+    if args.scale:
+        total = SCALES[args.scale]
+        args.profiles = args.profiles or 1
+        per_profile = total // args.profiles
+        args.skills = max(10, per_profile // 10)
+        args.projects = (per_profile - args.skills) // 2
+        args.work = per_profile - args.skills - args.projects
+    if not args.profiles:
+        seed_demo()
+        print(" Database seeded successfully")
+        return 0
+
+    started = time.perf_counter()
+    counts = seed_synthetic(args.profiles, args.skills, args.projects, args.work, args.tags,
+                            args.seed, args.batch_size)
+    elapsed = time.perf_counter() - started
+    rows = sum(counts.values())
+    print(" Synthetic data seeded:", ", ".join(f"{k}={v}" for k, v in counts.items()))
+    print(f" {rows} rows in {elapsed:.1f}s ({rows / elapsed * 60:,.0f} rows/min)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+from typing import List, NamedTuple
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Profile, Skill, Project, Work, project_skills
+from schemas import BundleOut, ProfileOut, ProjectOut, SkillOut, WorkOut
+
+# Read path without ORM objects: select only the output columns, validate the
+# plain row dicts in one TypeAdapter call per page and encode straight to
+# JSON bytes. The bytes are what gets cached, so a cache hit does no
+# serialization work at all.
+
+SKILL_COLUMNS = (Skill.id, Skill.name, Skill.proficiency, Skill.score)
+PROJECT_COLUMNS = (Project.id, Project.title, Project.description, Project.links)
+WORK_COLUMNS = (Work.id, Work.company, Work.role, Work.start_date, Work.end_date, Work.description)
+PROFILE_COLUMNS = (Profile.id, Profile.name, Profile.email, Profile.education, Profile.github, Profile.linkedin)
+
+skills_adapter = TypeAdapter(List[SkillOut])
+projects_adapter = TypeAdapter(List[ProjectOut])
+work_adapter = TypeAdapter(List[WorkOut])
+profile_adapter = TypeAdapter(ProfileOut)
+bundle_adapter = TypeAdapter(BundleOut)
+
+# bundle section -> tables its rows come from
+BUNDLE_SECTIONS = {
+    "profile": ("profiles",),
+    "skills": ("skills",),
+    "projects": ("projects",),
+    "work": ("work",),
+}
+
+
+class Page(NamedTuple):
+    body: bytes
+    count: int
+    last_id: int | None
+
+
+def fetch_rows(db: Session, stmt) -> list[dict]:
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def with_project_skills(db: Session, projects: list[dict]) -> list[dict]:
+    """Fill each project's ``skills`` (names) with one query for all of them."""
+    by_id = {}
+    for p in projects:
+        p["skills"] = []
+        by_id[p["id"]] = p
+    if by_id:
+        rows = db.execute(
+            select(project_skills.c.project_id, Skill.name)
+            .join(Skill, Skill.id == project_skills.c.skill_id)
+            .where(project_skills.c.project_id.in_(list(by_id)))
+            .order_by(Skill.name)
+        )
+        for project_id, name in rows:
+            by_id[project_id]["skills"].append(name)
+    return projects
+
+
+def encode_page(adapter: TypeAdapter, rows: list[dict]) -> Page:
+    body = adapter.dump_json(adapter.validate_python(rows))
+    return Page(body, len(rows), rows[-1]["id"] if rows else None)
+
+
+def profile_document(db: Session) -> dict | None:
+    """The first profile with its collections, as plain dicts (4 queries + 1 for project tags)."""
+    profile = db.execute(select(*PROFILE_COLUMNS).order_by(Profile.id).limit(1)).mappings().first()
+    if profile is None:
+        return None
+    doc = dict(profile)
+    doc["skills"] = fetch_rows(db, select(*SKILL_COLUMNS).where(Skill.profile_id == doc["id"]).order_by(Skill.id))
+    doc["projects"] = with_project_skills(
+        db, fetch_rows(db, select(*PROJECT_COLUMNS).where(Project.profile_id == doc["id"]).order_by(Project.id))
+    )
+    doc["work"] = fetch_rows(db, select(*WORK_COLUMNS).where(Work.profile_id == doc["id"]).order_by(Work.id))
+    return doc
+
+
+def encode_profile(doc: dict) -> bytes:
+    return profile_adapter.dump_json(profile_adapter.validate_python(doc))
+
+
+def bundle_document(db: Session, sections, limit: int) -> dict:
+    """The first page of each requested section, one query each (+1 for project tags)."""
+    doc = {}
+    if "profile" in sections:
+        profile = db.execute(select(*PROFILE_COLUMNS).order_by(Profile.id).limit(1)).mappings().first()
+        doc["profile"] = dict(profile) if profile else None
+    if "skills" in sections:
+        doc["skills"] = fetch_rows(db, select(*SKILL_COLUMNS).order_by(Skill.id).limit(limit))
+    if "projects" in sections:
+        doc["projects"] = with_project_skills(
+            db, fetch_rows(db, select(*PROJECT_COLUMNS).order_by(Project.id).limit(limit))
+        )
+    if "work" in sections:
+        doc["work"] = fetch_rows(db, select(*WORK_COLUMNS).order_by(Work.id).limit(limit))
+    return doc
+
+
+def encode_bundle(doc: dict) -> bytes:
+    # sections that weren't asked for are left out, not sent as null
+    return bundle_adapter.dump_json(bundle_adapter.validate_python(doc), exclude_unset=True)
+
+
+def json_response(response: Response, body: bytes) -> Response:
+    """Send pre-encoded JSON, keeping headers already set on ``response`` (ETag, cursor, ...)."""
+    out = Response(content=body, media_type="application/json")
+    for key, value in response.headers.items():
+        if key not in ("content-length", "content-type"):
+            out.headers[key] = value
+    return out
@@ -0,0 +1,63 @@
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from models import Project, Skill, project_skills
+from search import like_pattern
+
+# Project tags live in project_skills (project_id, skill_id). Clients send
+# skill names; they are matched case-insensitively against the skills of the
+# project's profile.
+
+
+def resolve_skill_ids(db: Session, profile_id: int, names: list[str]) -> dict[str, int]:
+    """Map lower-cased skill names to skill ids (unknown names are left out)."""
+    wanted = {n.strip().lower() for n in names if n.strip()}
+    if not wanted:
+        return {}
+    lowered = func.lower(Skill.name)
+    rows = db.execute(select(lowered, Skill.id).where(Skill.profile_id == profile_id, lowered.in_(wanted)))
+    return dict(rows.all())
+
+
+def unknown_skills(names: list[str], found: dict[str, int]) -> list[str]:
+    return [n for n in names if n.strip() and n.strip().lower() not in found]
+
+
+def skills_for(db: Session, profile_id: int, names: list[str]) -> list[Skill]:
+    found = resolve_skill_ids(db, profile_id, names)
+    missing = unknown_skills(names, found)
+    if missing:
+        raise HTTPException(400, f"Unknown skills: {', '.join(missing)}")
+    if not found:
+        return []
+    return db.scalars(select(Skill).where(Skill.id.in_(set(found.values())))).all()
+
+
+def set_project_skills(db: Session, tags: dict[int, set[int]]) -> None:
+    """Replace the tags of the given projects: one DELETE plus one executemany."""
+    if not tags:
+        return
+    db.execute(delete(project_skills).where(project_skills.c.project_id.in_(list(tags))))
+    rows = [{"project_id": p, "skill_id": s} for p, skill_ids in tags.items() for s in skill_ids]
+    if rows:
+        db.execute(insert(project_skills), rows)
+
+
+def untag(db: Session, model, ids) -> None:
+    # Core deletes skip the ORM's secondary cleanup, and SQLite doesn't
+    # enforce ON DELETE CASCADE unless foreign_keys is on
+    column = project_skills.c.skill_id if model is Skill else project_skills.c.project_id
+    db.execute(delete(project_skills).where(column.in_(list(ids))))
+
+
+def projects_using(skill: str):
+    """Semi-join filter: projects tagged with a skill whose name contains ``skill``.
+
+    Only the (small) skills table is pattern-matched; projects are then found
+    through the (skill_id, project_id) index, one row per project.
+    """
+    matching = select(Skill.id).where(Skill.name.ilike(like_pattern(skill), escape="\\"))
+    return Project.id.in_(
+        select(project_skills.c.project_id).where(project_skills.c.skill_id.in_(matching))
+    )
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+
+# a throwaway SQLite file and no response cache, set before the app is imported
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["DB_ASYNC"] = "0"
+os.environ["CACHE_TTL"] = "0"
+os.environ["RATE_LIMIT"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import database
+import main
+from dataio import reset_data
+from versions import TRACKED_TABLES
+
+ADMIN_HEADERS = {"X-API-Key": os.getenv("ADMIN_API_KEY", "admin 123")}
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as c:  # the lifespan migrates the new database
+        yield c
+
+
+@pytest.fixture
+def empty_db(client):
+    db = database.SessionLocal()
+    try:
+        reset_data(db)
+        main.mark_changed(db, *TRACKED_TABLES)
+        db.commit()
+    finally:
+        db.close()
+
+
+def count_queries(client, path: str, **kwargs):
+    """GET ``path``; returns the response and how many SQL statements it ran."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # reads go to the read-only SQLite pool, writes to the primary; count both
+    engines = [database.engine, *database.replica_engines]
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    try:
+        response = client.get(path, **kwargs)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", record)
+    return response, len(statements)
@@ -0,0 +1,17 @@
+from conftest import ADMIN_HEADERS
+
+
+def test_batch_update_rejects_non_integer_ids(client, empty_db):
+    client.get("/profile")  # default profile
+    created = client.post("/skills:batch", json=[{"name": "Go", "proficiency": "Beginner"}], headers=ADMIN_HEADERS)
+    skill_id = created.json()["results"][0]["id"]
+    assert skill_id == 1  # so {"id": true} would have hit it
+
+    r = client.patch("/skills:batch", json=[
+        {"id": True, "proficiency": "Expert"},
+        {"id": "1", "proficiency": "Expert"},
+        {"proficiency": "Expert"},
+    ], headers=ADMIN_HEADERS)
+    assert r.status_code == 200
+    assert [(x["ok"], x["error"]) for x in r.json()["results"]] == [(False, "id: required integer")] * 3
+    assert client.get("/skills").json()[0]["proficiency"] == "Beginner"
@@ -0,0 +1,20 @@
+from conftest import ADMIN_HEADERS
+
+
+def test_bundle_creates_default_profile(client, empty_db):
+    r = client.get("/bundle")
+    assert r.status_code == 200
+    assert r.json()["profile"]["name"]
+
+    # the page only loads /bundle; admin writes must work right after it
+    r = client.post("/skills", json={"name": "Zig", "proficiency": "Beginner"}, headers=ADMIN_HEADERS)
+    assert r.status_code in (200, 201), r.text
+    assert [s["name"] for s in client.get("/bundle").json()["skills"]] == ["Zig"]
+
+
+def test_bundle_without_profile_section_does_not_create_one(client, empty_db):
+    r = client.get("/bundle?sections=skills")
+    assert r.status_code == 200
+    assert r.json() == {"skills": []}
+    assert client.post("/skills", json={"name": "Zig", "proficiency": "Beginner"},
+                       headers=ADMIN_HEADERS).status_code == 400
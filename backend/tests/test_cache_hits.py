@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from sqlalchemy import update
+
+import database
+from cache import response_cache
+from conftest import ADMIN_HEADERS, count_queries
+from models import TableVersion
+from versions import version_snapshot
+
+
+@pytest.fixture
+def cache_on(monkeypatch, empty_db):
+    monkeypatch.setattr(response_cache, "ttl", 300.0)
+    monkeypatch.setattr(version_snapshot, "ttl", 60.0)
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+def test_hits_and_304s_skip_the_database(client, cache_on):
+    first, queries = count_queries(client, "/skills")
+    assert first.status_code == 200 and queries > 0
+
+    again, queries = count_queries(client, "/skills")
+    assert again.content == first.content and queries == 0
+
+    not_modified, queries = count_queries(client, "/skills", headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304 and queries == 0
+
+
+def test_own_write_is_seen_immediately(client, cache_on):
+    client.get("/profile")  # default profile, so skills can be added
+    before = client.get("/skills")
+    assert client.post("/skills", json={"name": "Zig", "proficiency": "Beginner"},
+                       headers=ADMIN_HEADERS).status_code in (200, 201)
+    after, queries = count_queries(client, "/skills")
+    assert queries > 0
+    assert after.headers["etag"] != before.headers["etag"]
+    assert [s["name"] for s in after.json()] == ["Zig"]
+
+
+def test_other_process_write_is_seen_after_ttl(client, cache_on, monkeypatch):
+    monkeypatch.setattr(version_snapshot, "ttl", 0.05)
+    before = client.get("/skills")
+    # a write from another worker: table_versions changes, but not through this process's session
+    with database.engine.begin() as conn:
+        conn.execute(update(TableVersion).where(TableVersion.name == "skills").values(version=TableVersion.version + 1))
+    time.sleep(0.1)
+    after, queries = count_queries(client, "/skills")
+    assert queries > 0 and after.headers["etag"] != before.headers["etag"]
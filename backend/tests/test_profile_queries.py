@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import insert, select
+
+import database
+from conftest import count_queries
+from models import Profile, Project, Skill, Work
+from seed import seed_demo
+
+# table_versions (ETag) + profile, skills, projects, project tags, work
+PROFILE_QUERIES = 6
+
+
+@pytest.fixture(scope="module", autouse=True)
+def demo_rows(client):
+    seed_demo()
+
+
+def test_profile_query_count(client):
+    response, queries = count_queries(client, "/profile")
+    assert response.status_code == 200
+    assert queries == PROFILE_QUERIES
+
+
+def test_profile_query_count_does_not_grow_with_rows(client):
+    with database.engine.begin() as conn:
+        profile_id = conn.execute(select(Profile.id).order_by(Profile.id).limit(1)).scalar()
+        conn.execute(insert(Skill), [
+            {"name": f"Extra {i}", "proficiency": "Beginner", "score": 1, "profile_id": profile_id} for i in range(20)
+        ])
+        conn.execute(insert(Project), [
+            {"title": f"Extra {i}", "description": "d", "links": {}, "profile_id": profile_id} for i in range(20)
+        ])
+        conn.execute(insert(Work), [
+            {"company": f"Extra {i}", "role": "r", "start_date": "2020", "profile_id": profile_id} for i in range(20)
+        ])
+    response, queries = count_queries(client, "/profile")
+    assert response.status_code == 200
+    assert queries == PROFILE_QUERIES
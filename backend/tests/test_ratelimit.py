@@ -0,0 +1,122 @@
+import asyncio
+import math
+
+import pytest
+
+import main
+from ratelimit import MemoryBackend, RedisBackend, SQLiteBackend
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class LocalRedis:
+    """In-process stand-in for redis.asyncio.Redis, enough for RedisBackend.
+
+    Hashes with PEXPIRE-style expiry; register_script runs a Python port of
+    the token-bucket Lua script against them.
+    """
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.hashes: dict[str, tuple[dict, float]] = {}
+
+    def live_keys(self) -> list[str]:
+        return [k for k, (_, expires) in self.hashes.items() if expires > self.clock()]
+
+    def register_script(self, source: str):
+        assert "HMGET" in source and "PEXPIRE" in source
+
+        async def script(keys, args):
+            limit, window, now = (float(a) for a in args)
+            fields, expires = self.hashes.get(keys[0], ({}, 0.0))
+            if expires <= self.clock():
+                fields = {}
+            tokens = fields.get("tokens", limit)
+            updated = fields.get("updated", now)
+            tokens = min(limit, tokens + max(0.0, now - updated) * limit / window)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) * window / limit
+            self.hashes[keys[0]] = ({"tokens": tokens, "updated": now}, self.clock() + math.ceil(window * 1000) / 1000)
+            return str(retry_after)
+
+        return script
+
+
+LIMIT, WINDOW = 3, 60
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def limiter(request, tmp_path, monkeypatch):
+    clock = Clock()
+    if request.param == "memory":
+        backend = MemoryBackend(LIMIT, WINDOW, clock=clock)
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(LIMIT, WINDOW, str(tmp_path / "ratelimit.db"), clock=clock)
+    else:
+        backend = RedisBackend(LIMIT, WINDOW, client=LocalRedis(clock), clock=clock)
+    monkeypatch.setattr(main, "rate_limiter", backend)
+    return backend, clock
+
+
+def test_drained_bucket_gets_429_with_retry_after(client, limiter):
+    for _ in range(LIMIT):
+        assert client.get("/health").status_code == 200
+    r = client.get("/health")
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == str(WINDOW // LIMIT)  # one token refills every 20 s
+
+
+def test_bucket_refills_as_time_passes(client, limiter):
+    _, clock = limiter
+    for _ in range(LIMIT):
+        client.get("/health")
+    assert client.get("/health").status_code == 429
+
+    clock.now += 15  # 3/4 of a token
+    r = client.get("/health")
+    assert r.status_code == 429 and r.headers["Retry-After"] == "5"
+
+    clock.now += 5
+    assert client.get("/health").status_code == 200
+    assert client.get("/health").status_code == 429
+
+    clock.now += WINDOW  # a full window refills the whole bucket, no more
+    assert [client.get("/health").status_code for _ in range(LIMIT + 1)] == [200] * LIMIT + [429]
+
+
+def test_clients_have_separate_buckets(client, limiter):
+    backend, _ = limiter
+    for _ in range(LIMIT):
+        client.get("/health")
+    assert client.get("/health").status_code == 429
+    assert asyncio.run(backend.hit("another-client")) == 0.0
+
+
+def test_memory_backend_stays_bounded():
+    clock = Clock()
+    backend = MemoryBackend(LIMIT, WINDOW, max_keys=10, clock=clock)
+    for i in range(50):
+        asyncio.run(backend.hit(f"client-{i}"))
+    assert len(backend) == 10
+    clock.now += WINDOW
+    asyncio.run(backend.hit("late"))  # the sweep drops keys idle for a full window
+    assert len(backend) == 1
+
+
+def test_redis_keys_expire_after_a_window():
+    clock = Clock()
+    redis = LocalRedis(clock)
+    backend = RedisBackend(LIMIT, WINDOW, client=redis, clock=clock)
+    asyncio.run(backend.hit("a"))
+    assert redis.live_keys() == ["rl:a"]
+    clock.now += WINDOW
+    assert redis.live_keys() == []
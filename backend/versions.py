@@ -0,0 +1,138 @@
+import hashlib
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from models import TableVersion
+
+TRACKED_TABLES = ("profiles", "skills", "projects", "work")
+# how long this process trusts its copy of table_versions; 0 = read it every time
+VERSION_TTL = float(os.getenv("VERSION_TTL", "1"))
+
+
+class VersionSnapshot:
+    """Process-local copy of table_versions, so cache hits don't need the database.
+
+    Filled by every table_etag read and dropped for a table as soon as this
+    process commits a bump to it. Writes made by other workers or instances
+    show up after at most ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0  # bumped by invalidate; a read that raced a commit isn't stored
+
+    def get(self, tables) -> dict[str, int] | None:
+        if self.ttl <= 0:
+            return None
+        now = time.monotonic()
+        versions = {}
+        with self._lock:
+            for table in tables:
+                entry = self._versions.get(table)
+                if entry is None or now - entry[1] > self.ttl:
+                    return None
+                versions[table] = entry[0]
+        return versions
+
+    def store(self, versions: dict[str, int], generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if generation == self.generation:
+                for table, version in versions.items():
+                    self._versions[table] = (version, now)
+
+    def invalidate(self, *tables: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for table in tables:
+                self._versions.pop(table, None)
+
+
+version_snapshot = VersionSnapshot(VERSION_TTL)
+
+
+def ensure_versions(conn) -> None:
+    """Insert a version row for every tracked table that lacks one."""
+    existing = set(conn.execute(select(TableVersion.name)).scalars())
+    # start from a timestamp so ETags from a wiped/recreated DB never collide
+    start = int(time.time() * 1000)
+    missing = [{"name": t, "version": start} for t in TRACKED_TABLES if t not in existing]
+    if missing:
+        conn.execute(TableVersion.__table__.insert(), missing)
+
+
+def bump_versions(db: Session, *tables: str) -> None:
+    if isinstance(db, Session):  # scripts pass a Connection; they run in their own process
+        db.info.setdefault("bumped_tables", set()).update(tables)
+    db.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(tables))
+        .values(version=TableVersion.version + 1)
+    )
+
+
+def get_versions(db: Session, tables) -> dict[str, int]:
+    rows = db.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(tables))
+    )
+    return dict(rows.all())
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_bumped_versions(session: Session) -> None:
+    tables = session.info.pop("bumped_tables", None)
+    if tables:
+        version_snapshot.invalidate(*tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bumped_versions(session: Session) -> None:
+    session.info.pop("bumped_tables", None)
+
+
+def _etag(versions: dict[str, int], key) -> str:
+    raw = repr((key, sorted(versions.items())))
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+def table_etag(db: Session, tables, *key) -> str:
+    """Strong ETag for a response built from ``tables`` with params ``key``."""
+    generation = version_snapshot.generation
+    versions = get_versions(db, tables)
+    version_snapshot.store(versions, generation)
+    return _etag(versions, key)
+
+
+def snapshot_etag(tables, *key) -> str | None:
+    """table_etag from this process's snapshot, without a query; None when it's stale."""
+    versions = version_snapshot.get(tables)
+    return _etag(versions, key) if versions is not None else None
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return etag in candidates
+
+
+def conditional_get(request: Request, response: Response, etag: str) -> Response | None:
+    """Return a 304 if the client already has ``etag``; else tag ``response``."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
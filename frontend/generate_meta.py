@@ -1,24 +1,80 @@
+import gzip
+import hashlib
+import html as html_lib
+import http.client
 import json
 import os
 import re
-import urllib.request
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 
 HTML_PATH = os.path.join(os.path.dirname(__file__), "index.html")
-
-
-def fetch_json(url: str, timeout: int = 8):
-    with urllib.request.urlopen(url, timeout=timeout) as resp:
-        return json.loads(resp.read().decode("utf-8"))
-
-
-def safe_get_json(url: str):
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "snapshot.json")
+SECTIONS = ("profile", "skills", "projects", "work")
+TIMEOUT = 8
+
+
+class Client:
+    """Keep-alive HTTP(S) connections to the API, one per thread."""
+
+    def __init__(self, base_url: str, timeout: int = TIMEOUT):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def get_json(self, path: str):
+        conn = self._conn()
+        try:
+            conn.request("GET", self.prefix + path, headers={"Accept-Encoding": "gzip"})
+            resp = conn.getresponse()
+            body = resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+        if resp.status != 200:
+            raise OSError(f"GET {path}: HTTP {resp.status}")
+        if resp.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body.decode("utf-8"))
+
+
+def safe_get_json(client: Client, path: str):
     try:
-        return fetch_json(url)
+        return client.get_json(path)
     except Exception:
         return None
 
 
+def fetch_sources(api_base: str) -> dict | None:
+    """One /bundle request; if the API has no /bundle, the four endpoints concurrently."""
+    client = Client(api_base)
+    bundle = safe_get_json(client, "/bundle")
+    if bundle is not None:
+        return {s: bundle.get(s) for s in SECTIONS}
+    with ThreadPoolExecutor(max_workers=len(SECTIONS)) as pool:
+        results = dict(zip(SECTIONS, pool.map(lambda s: safe_get_json(client, f"/{s}"), SECTIONS)))
+    if all(v is None for v in results.values()):
+        return None
+    if results["profile"]:
+        # /profile nests the collections; the snapshot keeps them at the top level
+        results["profile"] = {k: v for k, v in results["profile"].items() if k not in SECTIONS}
+    return results
+
+
 def read_html() -> str:
     with open(HTML_PATH, "r", encoding="utf-8") as f:
         return f.read()
@@ -35,28 +91,9 @@ def get_meta_content(html: str, attr: str, name: str) -> str | None:
     return m.group(1) if m else None
 
 
-def replace_meta(html: str, attr: str, name: str, content: str) -> str:
-    pattern = rf'(<meta\s+[^>]*{attr}="{re.escape(name)}"[^>]*content=")([^"]*)(")'
-    if re.search(pattern, html, flags=re.IGNORECASE):
-        return re.sub(pattern, rf'\g<1>{content}\3', html, flags=re.IGNORECASE)
-    insert = f'    <meta {attr}="{name}" content="{content}">\n'
-    return html.replace("</head>", insert + "</head>")
-
-
-def replace_title(html: str, title: str) -> str:
-    pattern = r"(<title>)(.*?)(</title>)"
-    if re.search(pattern, html, flags=re.IGNORECASE | re.DOTALL):
-        return re.sub(pattern, rf"\1{title}\3", html, flags=re.IGNORECASE | re.DOTALL)
-    return html
-
-
-def upsert_jsonld(html: str, jsonld: dict) -> str:
-    json_text = json.dumps(jsonld, ensure_ascii=True)
-    pattern = r'(<script\s+[^>]*id="meapi-jsonld"[^>]*>)(.*?)(</script>)'
-    if re.search(pattern, html, flags=re.IGNORECASE | re.DOTALL):
-        return re.sub(pattern, rf'\1{json_text}\3', html, flags=re.IGNORECASE | re.DOTALL)
-    insert = f'    <script type="application/ld+json" id="meapi-jsonld">{json_text}</script>\n'
-    return html.replace("</head>", insert + "</head>")
+def content_hash(data: dict, site_url: str | None) -> str:
+    raw = json.dumps({"data": data, "site_url": site_url}, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
 
 def truncate(text: str, max_len: int = 220) -> str:
@@ -65,6 +102,52 @@ def truncate(text: str, max_len: int = 220) -> str:
     return text[: max_len - 1].rstrip() + "…"
 
 
+HEAD_TAGS = re.compile(
+    r'<title>.*?</title>'
+    r'|<meta\s[^>]*>'
+    r'|<script\s[^>]*id="meapi-jsonld"[^>]*>.*?</script>',
+    flags=re.IGNORECASE | re.DOTALL,
+)
+META_KEY = re.compile(r'\b(name|property)="([^"]*)"', flags=re.IGNORECASE)
+META_CONTENT = re.compile(r'(content=")[^"]*(")', flags=re.IGNORECASE)
+
+
+def render(html: str, title: str, metas: dict[tuple[str, str], str], jsonld: dict) -> str:
+    """Apply the title, meta tags and JSON-LD in one pass; missing tags go before </head>."""
+    json_text = json.dumps(jsonld, ensure_ascii=True).replace("</", "<\\/")
+    seen = set()
+
+    def replace(m: re.Match) -> str:
+        tag = m.group(0)
+        lower = tag[:8].lower()
+        if lower.startswith("<title>"):
+            return f"<title>{html_lib.escape(title, quote=False)}</title>"
+        if lower.startswith("<script"):
+            seen.add("jsonld")
+            opening = tag[: tag.index(">") + 1]
+            return f"{opening}{json_text}</script>"
+        key = META_KEY.search(tag)
+        if not key:
+            return tag
+        k = (key.group(1).lower(), key.group(2))
+        if k not in metas:
+            return tag
+        seen.add(k)
+        content = html_lib.escape(metas[k], quote=True)
+        return META_CONTENT.sub(lambda c: f"{c.group(1)}{content}{c.group(2)}", tag, count=1)
+
+    html = HEAD_TAGS.sub(replace, html)
+    missing = [
+        f'    <meta {attr}="{name}" content="{html_lib.escape(value, quote=True)}">\n'
+        for (attr, name), value in metas.items() if (attr, name) not in seen
+    ]
+    if "jsonld" not in seen:
+        missing.append(f'    <script type="application/ld+json" id="meapi-jsonld">{json_text}</script>\n')
+    if missing:
+        html = html.replace("</head>", "".join(missing) + "</head>", 1)
+    return html
+
+
 def main() -> None:
     html = read_html()
 
@@ -74,9 +157,19 @@ def main() -> None:
         print("Missing API base URL.")
         return
 
-    profile = safe_get_json(f"{api_base}/profile") or {}
-    skills = safe_get_json(f"{api_base}/skills") or []
-    projects = safe_get_json(f"{api_base}/projects") or []
+    data = fetch_sources(api_base)
+    if data is None:
+        print("API unreachable; keeping the existing metadata and snapshot.")
+        return
+
+    digest = content_hash(data, site_url)
+    if get_meta_content(html, "name", "meapi-snapshot") == digest and os.path.exists(SNAPSHOT_PATH):
+        print("Metadata unchanged.")
+        return
+
+    profile = data["profile"] or {}
+    skills = data["skills"] or []
+    projects = data["projects"] or []
 
     name = profile.get("name") or "Me-API Playground"
     email = profile.get("email")
@@ -107,18 +200,18 @@ def main() -> None:
 
     title = f"{name} | Me-API Playground"
 
-    html = replace_title(html, title)
-    html = replace_meta(html, "name", "description", description)
-    html = replace_meta(html, "name", "author", name)
-    html = replace_meta(html, "name", "keywords", ", ".join(skill_names[:12]))
-
-    html = replace_meta(html, "property", "og:title", title)
-    html = replace_meta(html, "property", "og:description", description)
+    metas = {
+        ("name", "description"): description,
+        ("name", "author"): name,
+        ("name", "keywords"): ", ".join(skill_names[:12]),
+        ("property", "og:title"): title,
+        ("property", "og:description"): description,
+        ("name", "twitter:title"): title,
+        ("name", "twitter:description"): description,
+        ("name", "meapi-snapshot"): digest,
+    }
     if site_url:
-        html = replace_meta(html, "property", "og:url", site_url)
-
-    html = replace_meta(html, "name", "twitter:title", title)
-    html = replace_meta(html, "name", "twitter:description", description)
+        metas[("property", "og:url")] = site_url
 
     jsonld = {
         "@context": "https://schema.org",
@@ -139,9 +232,10 @@ def main() -> None:
         ],
     }
 
-    html = upsert_jsonld(html, jsonld)
-    write_html(html)
-    print("Metadata updated.")
+    with open(SNAPSHOT_PATH, "w", encoding="utf-8") as f:
+        json.dump({"hash": digest, **data}, f, ensure_ascii=False, separators=(",", ":"))
+    write_html(render(html, title, metas, jsonld))
+    print("Metadata and snapshot updated.")
 
 
 if __name__ == "__main__":
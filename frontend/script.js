@@ -222,25 +222,7 @@ function loadProfile() {
     }
 
     fetchJsonWithRetry(`${API}/profile`)
-        .then(p => {
-            const profile = {
-                ...DEFAULT_PROFILE,
-                ...p
-            };
-            writeCache(CACHE_KEYS.profile, profile);
-            profileView.innerHTML = `
-                <p><b>Name:</b> ${profile.name}</p>
-                <p><b>Email:</b> ${profile.email}</p>
-                <p><b>Education:</b> ${profile.education}</p>
-                <p><b>GitHub:</b> ${profile.github || "-"}</p>
-                <p><b>LinkedIn:</b> ${profile.linkedin || "-"}</p>
-            `;
-            pName.value = profile.name || "";
-            pEmail.value = profile.email || "";
-            pEdu.value = profile.education || "";
-            pGithub.value = profile.github || "";
-            pLinkedin.value = profile.linkedin || "";
-        })
+        .then(renderProfile)
         .catch(() => {
             const profile = { ...DEFAULT_PROFILE };
             profileView.innerHTML = `
@@ -260,6 +242,27 @@ function loadProfile() {
         });
 }
 
+function renderProfile(p) {
+    if (!showSection("profileView")) return;
+    const profile = {
+        ...DEFAULT_PROFILE,
+        ...p
+    };
+    writeCache(CACHE_KEYS.profile, profile);
+    profileView.innerHTML = `
+        <p><b>Name:</b> ${profile.name}</p>
+        <p><b>Email:</b> ${profile.email}</p>
+        <p><b>Education:</b> ${profile.education}</p>
+        <p><b>GitHub:</b> ${profile.github || "-"}</p>
+        <p><b>LinkedIn:</b> ${profile.linkedin || "-"}</p>
+    `;
+    pName.value = profile.name || "";
+    pEmail.value = profile.email || "";
+    pEdu.value = profile.education || "";
+    pGithub.value = profile.github || "";
+    pLinkedin.value = profile.linkedin || "";
+}
+
 function saveProfile() {
     if (!requireAdmin()) return;
     fetch(`${API}/profile`, {
@@ -321,26 +324,7 @@ function loadSkills() {
     }
 
     fetchJsonWithRetry(`${API}/skills`)
-        .then(data => {
-            const loggedIn = sessionStorage.getItem("auth");
-            skills.innerHTML = "";
-            data.forEach(s => {
-                skills.innerHTML += `
-                    <li>
-                        <strong>${s.name}</strong>
-                        <span class="badge ${s.proficiency.toLowerCase()}">
-                            ${s.proficiency}
-                        </span>
-                        ${loggedIn ? `<button onclick="editSkill(${s.id}, '${encodeURIComponent(s.name)}', '${encodeURIComponent(s.proficiency)}')">Edit</button>` : ""}
-                        ${loggedIn ? `<button onclick="deleteSkill(${s.id})">X</button>` : ""}
-                    </li>
-                `;
-            });
-            writeCache(CACHE_KEYS.skills, data);
-            if (!data.length) {
-                skills.innerHTML = "<li>No skills yet.</li>";
-            }
-        })
+        .then(renderSkills)
         .catch(() => {
             skills.innerHTML = `
                 <li>
@@ -352,6 +336,28 @@ function loadSkills() {
         });
 }
 
+function renderSkills(data) {
+    if (!showSection("skills")) return;
+    const loggedIn = sessionStorage.getItem("auth");
+    skills.innerHTML = "";
+    data.forEach(s => {
+        skills.innerHTML += `
+            <li>
+                <strong>${s.name}</strong>
+                <span class="badge ${s.proficiency.toLowerCase()}">
+                    ${s.proficiency}
+                </span>
+                ${loggedIn ? `<button onclick="editSkill(${s.id}, '${encodeURIComponent(s.name)}', '${encodeURIComponent(s.proficiency)}')">Edit</button>` : ""}
+                ${loggedIn ? `<button onclick="deleteSkill(${s.id})">X</button>` : ""}
+            </li>
+        `;
+    });
+    writeCache(CACHE_KEYS.skills, data);
+    if (!data.length) {
+        skills.innerHTML = "<li>No skills yet.</li>";
+    }
+}
+
 function addSkill() {
     if (!requireAdmin()) return;
     if (!skillName.value || !skillProf.value) {
@@ -447,25 +453,7 @@ function loadProjects() {
     }
 
     fetchJsonWithRetry(`${API}/projects`)
-        .then(data => {
-            const loggedIn = sessionStorage.getItem("auth");
-            projects.innerHTML = "";
-            data.forEach(p => {
-                projects.innerHTML += `
-                    <div class="project">
-                        <h3>${p.title}</h3>
-                        <p>${p.description}</p>
-                        <a href="${p.links?.link || "#"}" target="_blank" rel="noopener noreferrer">Open</a><br>
-                        ${loggedIn ? `<button onclick="editProject(${p.id}, '${encodeURIComponent(p.title)}', '${encodeURIComponent(p.description)}', '${encodeURIComponent(p.links?.link || "")}')">Edit</button>` : ""}
-                        ${loggedIn ? `<button onclick="deleteProject(${p.id})">Delete</button>` : ""}
-                    </div>
-                `;
-            });
-            writeCache(CACHE_KEYS.projects, data);
-            if (!data.length) {
-                projects.innerHTML = "<p>No projects yet.</p>";
-            }
-        })
+        .then(renderProjects)
         .catch(() => {
             projects.innerHTML = `
                 <p>
@@ -477,6 +465,27 @@ function loadProjects() {
         });
 }
 
+function renderProjects(data) {
+    if (!showSection("projects")) return;
+    const loggedIn = sessionStorage.getItem("auth");
+    projects.innerHTML = "";
+    data.forEach(p => {
+        projects.innerHTML += `
+            <div class="project">
+                <h3>${p.title}</h3>
+                <p>${p.description}</p>
+                <a href="${p.links?.link || "#"}" target="_blank" rel="noopener noreferrer">Open</a><br>
+                ${loggedIn ? `<button onclick="editProject(${p.id}, '${encodeURIComponent(p.title)}', '${encodeURIComponent(p.description)}', '${encodeURIComponent(p.links?.link || "")}')">Edit</button>` : ""}
+                ${loggedIn ? `<button onclick="deleteProject(${p.id})">Delete</button>` : ""}
+            </div>
+        `;
+    });
+    writeCache(CACHE_KEYS.projects, data);
+    if (!data.length) {
+        projects.innerHTML = "<p>No projects yet.</p>";
+    }
+}
+
 function addProject() {
     if (!requireAdmin()) return;
     if (!projTitle.value || !projDesc.value) {
@@ -576,27 +585,7 @@ function loadWork() {
     }
 
     fetchJsonWithRetry(`${API}/work`)
-        .then(data => {
-            const loggedIn = sessionStorage.getItem("auth");
-            workList.innerHTML = "";
-            data.forEach(w => {
-                workList.innerHTML += `
-                    <li>
-                        <div>
-                            <strong>${w.role}</strong> at ${w.company}<br>
-                            <small>${w.start_date} - ${w.end_date || "Present"}</small><br>
-                            <span>${w.description || ""}</span>
-                        </div>
-                        ${loggedIn ? `<button onclick="editWork(${w.id}, '${encodeURIComponent(w.company)}', '${encodeURIComponent(w.role)}', '${encodeURIComponent(w.start_date)}', '${encodeURIComponent(w.end_date || "")}', '${encodeURIComponent(w.description || "")}')">Edit</button>` : ""}
-                        ${loggedIn ? `<button onclick="deleteWork(${w.id})">Delete</button>` : ""}
-                    </li>
-                `;
-            });
-            writeCache(CACHE_KEYS.work, data);
-            if (!data.length) {
-                workList.innerHTML = "<li>No work entries yet.</li>";
-            }
-        })
+        .then(renderWork)
         .catch(() => {
             workList.innerHTML = `
                 <li>
@@ -608,6 +597,29 @@ function loadWork() {
         });
 }
 
+function renderWork(data) {
+    if (!showSection("workList")) return;
+    const loggedIn = sessionStorage.getItem("auth");
+    workList.innerHTML = "";
+    data.forEach(w => {
+        workList.innerHTML += `
+            <li>
+                <div>
+                    <strong>${w.role}</strong> at ${w.company}<br>
+                    <small>${w.start_date} - ${w.end_date || "Present"}</small><br>
+                    <span>${w.description || ""}</span>
+                </div>
+                ${loggedIn ? `<button onclick="editWork(${w.id}, '${encodeURIComponent(w.company)}', '${encodeURIComponent(w.role)}', '${encodeURIComponent(w.start_date)}', '${encodeURIComponent(w.end_date || "")}', '${encodeURIComponent(w.description || "")}')">Edit</button>` : ""}
+                ${loggedIn ? `<button onclick="deleteWork(${w.id})">Delete</button>` : ""}
+            </li>
+        `;
+    });
+    writeCache(CACHE_KEYS.work, data);
+    if (!data.length) {
+        workList.innerHTML = "<li>No work entries yet.</li>";
+    }
+}
+
 function addWork() {
     if (!requireAdmin()) return;
     if (!workCompany.value || !workRole.value || !workStart.value) {
@@ -686,13 +698,55 @@ function cancelWorkEdit() {
 
 updateUI();
 
-function loadAllPublicSections() {
+function loadSectionsSeparately() {
     loadProfile();
     loadSkills();
     loadProjects();
     loadWork();
 }
 
+/* ---------- BUNDLE (one request for the whole page) ---------- */
+function showCachedSections() {
+    const profile = readCache(CACHE_KEYS.profile);
+    if (profile) renderProfile(profile);
+    [
+        [CACHE_KEYS.skills, renderSkills],
+        [CACHE_KEYS.projects, renderProjects],
+        [CACHE_KEYS.work, renderWork]
+    ].forEach(([key, render]) => {
+        const data = readCache(key);
+        if (Array.isArray(data) && data.length) render(data);
+    });
+}
+
+function renderBundle(data) {
+    // a missing profile is not rendered (or cached) as the placeholder
+    if (data.profile) renderProfile(data.profile);
+    renderSkills(data.skills || []);
+    renderProjects(data.projects || []);
+    renderWork(data.work || []);
+}
+
+function loadAllPublicSections() {
+    showCachedSections();
+    let live = false;
+    // build-time snapshot (generate_meta.py) from the CDN: instant while the API wakes up
+    fetchJsonWithRetry("snapshot.json", {}, 0)
+        .then(data => {
+            if (!live) renderBundle(data);
+        })
+        .catch(() => {});
+    fetchJsonWithRetry(`${API}/bundle`, {}, 1)
+        .then(data => {
+            live = true;
+            renderBundle(data);
+            // older backend without a profile yet: GET /profile creates the default one
+            if (!data.profile) loadProfile();
+        })
+        // older backend or bundle failing: per-section loaders (cached view + retries)
+        .catch(loadSectionsSeparately);
+}
+
 if (document.readyState === "loading") {
     document.addEventListener("DOMContentLoaded", loadAllPublicSections);
 } else {